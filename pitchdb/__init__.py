@@ -0,0 +1 @@
+"""Data layer for the V26 pitcher database app (no Streamlit imports here)."""
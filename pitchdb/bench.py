@@ -0,0 +1,186 @@
+"""Headless benchmarks for the hot paths behind the Streamlit pages.
+
+    $ python -m pitchdb.bench --sizes 1000,10000,100000 --out bench.json
+    $ python -m pitchdb.bench --compare bench.json
+
+Rosters are synthetic but drawn from the real TEAMS/ROLES/PITCH_TYPES/
+IMPAC_TYPES vocabularies, with a fixed seed so runs on different commits
+time the same data.  Each case reports the best and median of ``--repeat``
+runs in milliseconds; ``--out`` writes them as JSON and ``--compare`` prints
+the ratio against an earlier file.  ``snapshot.*.loads`` rows also give the
+encoded size of each :mod:`pitchdb.snapshot` format.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pitchdb.constants import IMPAC_TYPES, PITCH_TYPES, ROLES, TEAMS
+from pitchdb.migrations import classify, migrate, wrap
+from pitchdb.render import CardCache, player_card_html
+from pitchdb.repo import PlayerRepo
+from pitchdb.snapshot import FORMATS, dumps, loads
+from pitchdb.sorting import SORT_KEYS
+from pitchdb.storage import JSONStorage
+
+PAGE = 50
+SYLLABLES = "김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허남심노하곽성차주우구민유나진지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감음빈동온호범좌팽승간상갈단견당화창"
+
+
+def roster(n, seed=0):
+    """``n`` synthetic cards, classified from raw_prefix like default_data."""
+    rng = random.Random(seed)
+    prefixes = [str(y) for y in range(1, 25)] * 2 + IMPAC_TYPES + ["국대", "라이브", "골"]
+    raw = []
+    for _ in range(n):
+        raw.append({"team": rng.choice(TEAMS), "role": rng.choice(ROLES),
+                    "raw_prefix": rng.choice(prefixes),
+                    "name": "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))),
+                    "pitches": rng.sample(PITCH_TYPES, rng.randint(2, 6))})
+    for p, parsed in zip(raw, classify([p["raw_prefix"] for p in raw])):
+        p["player_type"], p["year"], p["impac_type"] = parsed
+    return raw
+
+
+def timeit(fn, repeat, setup=None):
+    """Best and median wall time of ``fn(setup())`` in ms (setup is untimed)."""
+    runs = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t = time.perf_counter()
+        fn(arg) if setup else fn()
+        runs.append((time.perf_counter() - t) * 1000)
+    return {"best": round(min(runs), 4), "median": round(statistics.median(runs), 4)}
+
+
+# Filter combinations the 🔍 검색 page produces, from none to everything.
+FILTERS = {
+    "none": {},
+    "team": {"team": ("두산",)},
+    "team+role": {"team": ("두산", "LG"), "role": ("선발",)},
+    "type+impac": {"player_type": ("임팩",), "impac_type": ("우에", "좌에")},
+    "pitches": {"pitches": ("포심", "슬라이더")},
+    "year": {"player_type": ("시그",), "year": "22"},
+    "name": {"name": "김"},
+    "chosung": {"name": "ㄱㅇ"},
+    "all": {"name": "김", "team": ("두산", "LG", "KT"), "role": ("선발", "중계"), "pitches": ("포심",)},
+}
+
+
+def bench_size(n, repeat):
+    players = roster(n)
+    out = {}
+    repo = None
+    def build():
+        nonlocal repo
+        repo = PlayerRepo(players)
+    out["repo.build"] = timeit(build, 1)
+    index = repo.index
+
+    for name, f in FILTERS.items():
+        out[f"filter.{name}"] = timeit(lambda: index.query(**f), repeat)
+
+    narrow = index.query(**FILTERS["team+role"])
+    for mode in SORT_KEYS:
+        out[f"sort.{mode}.page"] = timeit(lambda: repo.sorted_ids(mode, index.all, 0, PAGE), repeat)
+        out[f"sort.{mode}.last_page"] = timeit(lambda: repo.sorted_ids(mode, index.all, n - PAGE, n), repeat)
+        out[f"sort.{mode}.filtered"] = timeit(lambda: repo.sorted_ids(mode, narrow), repeat)
+
+    page = [dict(repo.get(pid)) for pid in repo.sorted_ids("팀순", index.all, 0, PAGE)]
+    out["render.page"] = timeit(lambda: [player_card_html(p) for p in page], repeat)
+    cards = CardCache()
+    ids = repo.sorted_ids("팀순", index.all, 0, PAGE)
+    out["render.page.cached"] = timeit(lambda: [cards.card(repo, pid) for pid in ids], repeat)
+
+    out["migrate"] = timeit(lambda ps: migrate(ps, 0), repeat, setup=lambda: [dict(p) for p in players])
+
+    doc = wrap(players, range(n))
+    for fmt in FORMATS:
+        text = dumps(doc, fmt)
+        out[f"snapshot.{fmt}.dumps"] = timeit(lambda: dumps(doc, fmt), repeat)
+        out[f"snapshot.{fmt}.loads"] = {**timeit(lambda: loads(text), repeat), "bytes": len(text.encode("utf-8"))}
+
+    with tempfile.TemporaryDirectory() as d:
+        store = JSONStorage([Path(d) / "pitcher_data.json"])
+        out["json.save"] = timeit(lambda: store.save(players), repeat)
+        out["json.load"] = timeit(store.load, repeat)
+    return out
+
+
+# Runs in a fresh interpreter: imports, load the data file, first page of cards.
+COLD_START = """
+import time
+t = time.perf_counter()
+from pitchdb.render import chunked
+from pitchdb.storage import JSONStorage
+from pitchdb.store import SharedStore
+store = SharedStore(*JSONStorage([{path!r}]).load())
+ids = store.repo.sorted_ids("팀순", store.repo.index.all, 0, {page})
+html = list(chunked([store.card(pid) for pid in ids]))
+print((time.perf_counter() - t) * 1000)
+"""
+
+
+def cold_start(repeat, path):
+    """Time-to-first-page from a cold process: in-script ms and whole-process wall ms."""
+    code = COLD_START.format(path=str(path), page=PAGE)
+    root = Path(__file__).resolve().parent.parent
+    inner, wall = [], []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=root, check=True)
+        wall.append((time.perf_counter() - t) * 1000)
+        inner.append(float(r.stdout.strip().splitlines()[-1]))
+    stat = lambda ms: {"best": round(min(ms), 4), "median": round(statistics.median(ms), 4)}
+    return {"startup.first_page": stat(inner), "startup.process": stat(wall)}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(sizes, repeat):
+    results = {}
+    data_file = Path(__file__).resolve().parent.parent / "pitcher_data.json"
+    if data_file.exists():
+        results["startup"] = cold_start(repeat, data_file)
+    results.update((str(n), bench_size(n, repeat)) for n in sizes)
+    return {"commit": _commit(), "python": platform.python_version(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat, "results": results}
+
+
+def report(doc, base=None):
+    for size, cases in doc["results"].items():
+        print(f"── {size if size == 'startup' else size + ' cards'} " + "─" * 40)
+        old = (base or {}).get("results", {}).get(size, {})
+        for name, r in cases.items():
+            line = f"{name:<28}{r['best']:>12.3f} ms{r['median']:>12.3f} ms"
+            if "bytes" in r:
+                line += f"{r['bytes']:>13,} B"
+            if name in old and old[name]["best"]:
+                line += f"{r['best'] / old[name]['best']:>9.2f}x"
+            print(line)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Time filter/sort/render/persistence paths on synthetic rosters.")
+    ap.add_argument("--sizes", default="1000,10000,100000", help="comma-separated roster sizes")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", help="write results as JSON")
+    ap.add_argument("--compare", help="earlier --out file to compare against")
+    a = ap.parse_args()
+    doc = run([int(s) for s in a.sizes.split(",")], a.repeat)
+    base = json.loads(Path(a.compare).read_text(encoding="utf-8")) if a.compare else None
+    report(doc, base)
+    if a.out:
+        Path(a.out).write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
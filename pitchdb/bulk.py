@@ -0,0 +1,166 @@
+"""Bulk CSV/JSONL/JSON import and export.
+
+Rows are read one line at a time (or one list entry of a saved JSON
+document), validated against the app vocabularies and turned into player
+dicts the same way the ➕ 선수 추가 form does; bad rows are reported with
+their line number instead of aborting the import.  Uploads may be UTF-8 or
+CP949 (what Korean Excel exports).
+"""
+import csv
+import io
+import json
+import re
+
+from pitchdb.constants import IMPAC_TYPES, PITCH_TYPES, ROLES, TEAMS, TYPE_CFG
+from pitchdb.migrations import migrate, parse_prefix, unwrap
+from pitchdb.snapshot import loads
+
+EXPORT_FIELDS = ("team", "role", "raw_prefix", "name", "pitches", "player_type", "year", "impac_type")
+PITCH_SPLIT = re.compile(r"[/|,;\s]+")
+ENCODINGS = ("utf-8-sig", "cp949")
+
+
+def _text(f):
+    """Text stream over an uploaded (binary) or already-text file; raises UnicodeDecodeError."""
+    if isinstance(f, io.TextIOBase):
+        return f
+    data = f.read()
+    for enc in ENCODINGS[:-1]:
+        try:
+            return io.StringIO(data.decode(enc), newline="")
+        except UnicodeDecodeError:
+            pass
+    return io.StringIO(data.decode(ENCODINGS[-1]), newline="")
+
+
+def read_rows(f, fmt):
+    """Yield ``(line_no, row_dict_or_None, error)`` for a "csv", "jsonl" or "json" file."""
+    try:
+        text = _text(f)
+    except UnicodeDecodeError:
+        yield 0, None, f"파일 인코딩을 읽을 수 없습니다 ({' / '.join(ENCODINGS)})"
+        return
+    if fmt == "json":
+        try:
+            players, _ = unwrap(loads(text.read()))
+        except Exception as e:
+            yield 0, None, f"JSON 문서 오류: {e}"
+            return
+        for n, row in enumerate(players, 1):
+            yield (n, row, None) if isinstance(row, dict) else (n, None, "객체가 아닙니다")
+        return
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {k.strip(): (v or "").strip() for k, v in row.items() if k}, None
+        return
+    for n, line in enumerate(text, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield n, None, f"JSON 오류: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield n, None, "객체가 아닙니다"
+            continue
+        yield n, row, None
+
+
+def _blank(v):
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def to_player(row):
+    """Validate one row; return ``(player, errors)``."""
+    odd = [k for k in EXPORT_FIELDS if k != "pitches" and isinstance(row.get(k), (list, dict))]
+    if odd:
+        return None, [f"값 형식 오류: {', '.join(odd)}"]
+    errors = []
+    migrate([row], 0)  # files exported before schema versioning may use legacy values
+    name = str(row.get("name") or "").strip()
+    team = str(row.get("team") or "").strip()
+    role = str(row.get("role") or "").strip()
+    if not name: errors.append("선수명 없음")
+    if team not in TEAMS: errors.append(f"알 수 없는 팀: {team or '(빈칸)'}")
+    if role not in ROLES: errors.append(f"알 수 없는 역할: {role or '(빈칸)'}")
+
+    pitches = row.get("pitches") or []
+    if isinstance(pitches, str):
+        pitches = [pt for pt in PITCH_SPLIT.split(pitches.strip()) if pt]
+    if not isinstance(pitches, list):
+        errors.append(f"구종은 목록이나 ‘/’로 구분한 문자열이어야 합니다: {pitches!r}")
+        pitches = []
+    else:
+        bad = [pt for pt in pitches if not isinstance(pt, str) or pt not in PITCH_TYPES]
+        if bad: errors.append(f"알 수 없는 구종: {', '.join(map(str, bad))}")
+        pitches = list(dict.fromkeys(pt for pt in pitches if isinstance(pt, str)))
+        if not pitches: errors.append("구종 없음")
+
+    ptype = row.get("player_type")
+    if _blank(ptype):
+        # No explicit card type: classify raw_prefix exactly like default_data.
+        raw_prefix = str(row.get("raw_prefix") or "").strip()
+        ptype, year, impac = parse_prefix(raw_prefix)
+    else:
+        ptype = str(ptype).strip()
+        year = None if _blank(row.get("year")) else str(row["year"]).strip()
+        impac = None if _blank(row.get("impac_type")) else str(row["impac_type"]).strip()
+        if ptype not in TYPE_CFG: errors.append(f"알 수 없는 카드 종류: {ptype}")
+        if year is not None and not year.isdigit(): errors.append(f"연도는 숫자여야 합니다: {year}")
+        if impac is not None and impac not in IMPAC_TYPES: errors.append(f"알 수 없는 임팩 종류: {impac}")
+        if ptype != "임팩": impac = None
+        raw_prefix = (year or "") if ptype in ("골글","시그") else (impac or "")
+
+    player = {"team": team, "role": role, "raw_prefix": raw_prefix, "name": name, "pitches": pitches,
+              "player_type": ptype, "year": year, "impac_type": impac}
+    return player, errors
+
+
+def dedupe_key(p):
+    return (p.get("team"), p.get("role"), p.get("name"), p.get("player_type"),
+            str(p.get("year") or ""), p.get("impac_type"), frozenset(p.get("pitches", [])))
+
+
+def import_rows(rows, existing=()):
+    """Validate and dedupe; returns ``(players, errors, duplicates)``.
+
+    ``errors`` is a list of ``(line_no, message)``; rows matching ``existing``
+    players or an earlier row of the same file count as duplicates.
+    """
+    seen = {dedupe_key(p) for p in existing}
+    players, errors, duplicates = [], [], 0
+    for line_no, row, err in rows:
+        if err:
+            errors.append((line_no, err))
+            continue
+        p, errs = to_player(row)
+        if errs:
+            errors.append((line_no, "; ".join(errs)))
+            continue
+        key = dedupe_key(p)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        players.append(p)
+    return players, errors, duplicates
+
+
+def export_lines(players, fmt):
+    """Yield the players as CSV (pitches joined with "/") or JSONL lines."""
+    if fmt == "jsonl":
+        for p in players:
+            yield json.dumps(dict(p), ensure_ascii=False) + "\n"
+        return
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(EXPORT_FIELDS)
+    yield buf.getvalue()
+    for p in players:
+        buf.seek(0)
+        buf.truncate()
+        w.writerow(["/".join(p.get("pitches", [])) if k == "pitches" else ("" if p.get(k) is None else p.get(k))
+                    for k in EXPORT_FIELDS])
+        yield buf.getvalue()
@@ -0,0 +1,7 @@
+PITCH_TYPES = ["포심","투심","체인지업","서클체인지업","슬라이더","커브","커터","싱커","포크","스플리터"]
+TEAMS = ["삼성","기아","KT","한화","LG","SSG","키움","롯데","NC","두산"]
+ROLES = ["선발","중계","마무리"]
+IMPAC_TYPES = ["우에","좌에","여사","가사","당쇠","구조대","베테랑","탑","구마",
+               "얼리","베포","분메","파볼","저니맨","키플","백노","난세","죄에",
+               "전천후","마무리","FA","올","중계","느미"]
+TYPE_CFG = {"골글":("#c9a227","black"), "시그":("#dc2626","white"), "임팩":("#16a34a","white"), "국대":("#2563eb","white"), "라이브":("#e8eaf0","black")}
@@ -0,0 +1,32 @@
+"""Datasets: independent card databases (e.g. one per season), one file each.
+
+The default dataset keeps the original names (``pitcher_data.json`` locally
+and in the Gist); dataset ``X`` lives in ``pitcher_data.X.json`` (and
+``pitcher_data.X.db`` / ``pitcher_data.X.log.jsonl`` for the other local
+backends).  Only the datasets someone opens get loaded, and a save writes
+only that dataset's file.
+"""
+import re
+from pathlib import Path
+
+DEFAULT = "V26"
+NAME = r"[0-9A-Za-z가-힣_-]{1,32}"
+VALID = re.compile(NAME)
+_FILE = re.compile(rf"pitcher_data\.({NAME})\.(?:json|db)")
+
+
+def file_name(dataset):
+    """``pitcher_data.json`` for the default dataset, else ``pitcher_data.<dataset>.json``."""
+    return "pitcher_data.json" if dataset == DEFAULT else f"pitcher_data.{dataset}.json"
+
+
+def with_dataset(path, dataset):
+    """``path`` (a default-dataset file name) renamed for ``dataset``."""
+    path = Path(path)
+    return path if dataset == DEFAULT else path.with_name(f"{path.stem}.{dataset}{path.suffix}")
+
+
+def from_file_names(names):
+    """Datasets found among file names; the default one always comes first."""
+    found = {m.group(1) for n in names if (m := _FILE.fullmatch(n))}
+    return [DEFAULT] + sorted(found - {DEFAULT})
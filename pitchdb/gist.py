@@ -0,0 +1,108 @@
+"""HTTP client for the GitHub Gist API.
+
+One pooled ``requests.Session`` (keep-alive) per Gist, used by its
+:class:`~pitchdb.sync.GistSync` for every dataset file.  Every request has a
+connect and a read timeout, so a slow API cannot hang the script thread.
+Connection errors, timeouts, 429 and 5xx are retried with exponential
+backoff and full jitter.
+
+A circuit breaker sits in front of it: after ``failures`` calls in a row
+fail, it opens and calls raise :class:`CircuitOpen` straight away for
+``cooldown`` seconds.  Then one probe call is let through, and its result
+closes the breaker or opens it again.  Callers treat ``CircuitOpen`` as
+"use the local files".
+"""
+import random
+import threading
+import time
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class CircuitOpen(RuntimeError):
+    pass
+
+
+class GistClient:
+    def __init__(self, url, token, timeout=(3.05, 10.0), retries=2, backoff=0.5, max_backoff=8.0,
+                 failures=3, cooldown=60.0, session=None):
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=8))
+        self.session = session
+        self.session.headers.update({"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"})
+        self.url = url
+        self.timeout = timeout      # (connect, read) seconds
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failures = failures
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.state = "closed"       # closed | open | half_open
+        self.failed = 0             # consecutive failed calls
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0           # calls refused while open
+        self.last_error = None
+
+    def get(self, url=None, headers=None):
+        """GET the Gist, or ``url`` (its commits, a raw file) through the same pool and breaker."""
+        return self._call("GET", url, headers=headers)
+
+    def patch(self, json):
+        return self._call("PATCH", json=json)
+
+    def status(self):
+        with self.lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+            return {"state": self.state, "failed": self.failed, "trips": self.trips,
+                    "rejected": self.rejected, "last_error": self.last_error, "retry_in": retry_in}
+
+    def _admit(self):
+        with self.lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"   # this call is the probe
+                return
+            self.rejected += 1
+            raise CircuitOpen(f"Gist API unavailable ({self.last_error})")
+
+    def _record(self, error):
+        with self.lock:
+            if error is None:
+                self.state, self.failed = "closed", 0
+                return
+            self.last_error = error
+            self.failed += 1
+            if self.state == "half_open" or self.failed >= self.failures:
+                if self.state != "open":
+                    self.trips += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def _delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def _call(self, method, url=None, **kwargs):
+        """Response of the last attempt; raises on a transport error or an open breaker."""
+        self._admit()
+        for attempt in range(self.retries + 1):
+            try:
+                r = self.session.request(method, url or self.url, timeout=self.timeout, **kwargs)
+            except Exception as e:   # connect/read timeout, refused, reset …
+                r, error = None, f"{type(e).__name__}: {e}"
+            else:
+                error = None if r.status_code not in RETRY_STATUS else f"{method} {r.status_code}"
+            if error is None:
+                break
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt))
+        self._record(error)
+        if r is None:
+            raise ConnectionError(f"Gist {method}: {error}")
+        return r
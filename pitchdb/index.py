@@ -0,0 +1,150 @@
+"""Bitset index over the player table.
+
+Bit ``i`` of every mask refers to row ``i`` of :class:`PlayerTable`.  Each
+(field, value) pair and each pitch keeps one Python int, so a filter button
+is a single ``|``/``&``.  Removed rows stay empty so the positions of later
+players never shift.
+"""
+from pitchdb.names import NameIndex
+from pitchdb.table import PlayerTable
+
+FIELDS = ("team", "role", "player_type", "impac_type", "year")
+
+
+def _key(field, p):
+    v = p.get(field)
+    if field == "year":
+        return str(v or "")  # same normalisation as the 연도 text filter
+    return v
+
+
+def mask_of(positions):
+    """Bitmask with the given positions set, built in one pass over a byte buffer."""
+    positions = list(positions)
+    if len(positions) < 2:
+        return 1 << positions[0] if positions else 0
+    buf = bytearray(max(positions) // 8 + 1)
+    for pos in positions:
+        buf[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(buf, "little")
+
+
+def iter_bits(mask):
+    """Yield set bit positions of ``mask`` in ascending order."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PlayerIndex:
+    def __init__(self, players=()):
+        self.table = PlayerTable()
+        self.all = 0
+        self.bits = {f: {} for f in FIELDS}
+        self.pitch_bits = {}
+        self.names = NameIndex()
+        self.add_many(enumerate(players))
+
+    def add_many(self, items):
+        """Fill an empty index from ``(position, player)`` pairs.
+
+        Same result as ``add`` per player, but every mask is built once from
+        its positions instead of OR-ing one bit at a time into growing ints.
+        """
+        if self.all:
+            raise ValueError("add_many needs an empty index")
+        positions = {f: {} for f in FIELDS}
+        pitches, names = {}, {}
+        for pos, p in items:
+            self.table.set(pos, p)
+            for f in FIELDS:
+                positions[f].setdefault(_key(f, p), []).append(pos)
+            for pt in p.get("pitches", []):
+                pitches.setdefault(pt, []).append(pos)
+            names.setdefault(p.get("name", ""), []).append(pos)
+        self.all = mask_of(pos for ps in names.values() for pos in ps)
+        self.bits = {f: {k: mask_of(ps) for k, ps in d.items()} for f, d in positions.items()}
+        self.pitch_bits = {pt: mask_of(ps) for pt, ps in pitches.items()}
+        self.names.add_many({name: mask_of(ps) for name, ps in names.items()})
+
+    def add(self, p, pos=None):
+        """Store ``p`` in a new slot (or the empty slot ``pos``); return its position."""
+        if pos is None:
+            pos = len(self.table)
+        elif self.table[pos] is not None:
+            raise ValueError(f"slot {pos} is taken")
+        self.replace(pos, p)
+        return pos
+
+    def replace(self, pos, p):
+        """Put ``p`` at ``pos``, clearing whatever bits the old record set."""
+        if self.table[pos] is not None:
+            self.table.encode(p)   # a full vocabulary raises here, before the old record is unindexed
+            self.remove(pos)
+        self.table.set(pos, p)
+        bit = 1 << pos
+        self.all |= bit
+        for f in FIELDS:
+            d = self.bits[f]
+            k = _key(f, p)
+            d[k] = d.get(k, 0) | bit
+        for pt in p.get("pitches", []):
+            self.pitch_bits[pt] = self.pitch_bits.get(pt, 0) | bit
+        self.names.add(p.get("name", ""), pos)
+
+    def remove(self, pos):
+        p = self.table[pos]
+        clear = ~(1 << pos)
+        self.all &= clear
+        for f in FIELDS:
+            d = self.bits[f]
+            k = _key(f, p)
+            d[k] &= clear
+            if not d[k]:
+                del d[k]
+        for pt in p.get("pitches", []):
+            self.pitch_bits[pt] &= clear
+        self.names.remove(p["name"], pos)
+        self.table.clear(pos)
+
+    def any_of(self, field, values):
+        """OR of the masks for ``values``; all players when ``values`` is empty."""
+        if not values:
+            return self.all
+        d = self.bits[field]
+        m = 0
+        for v in values:
+            m |= d.get(v, 0)
+        return m
+
+    def counts(self, field, mask):
+        """{value: number of players in ``mask`` with that value} (non-zero only)."""
+        out = {}
+        for v, m in self.bits[field].items():
+            n = (m & mask).bit_count()
+            if n:
+                out[v] = n
+        return out
+
+    def with_pitches(self, pitches):
+        """Players that throw every pitch in ``pitches``."""
+        m = self.all
+        for pt in pitches:
+            m &= self.pitch_bits.get(pt, 0)
+        return m
+
+    def query(self, name="", team=(), role=(), player_type=(), impac_type=(), pitches=(), year=""):
+        """Return the result mask for the 🔍 검색 filter set."""
+        m = self.all
+        m &= self.any_of("team", team)
+        m &= self.any_of("role", role)
+        m &= self.any_of("player_type", player_type)
+        m &= self.any_of("impac_type", impac_type)
+        if pitches:
+            m &= self.with_pitches(pitches)
+        if year:
+            m &= self.bits["year"].get(year, 0)
+        if name and m:
+            m &= self.names.mask(name)
+        return m
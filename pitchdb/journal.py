@@ -0,0 +1,140 @@
+"""Journaled local storage: snapshot + append-only change log.
+
+``pitcher_data.json`` is a versioned player document (see
+:mod:`pitchdb.migrations`).  Every insert/update/delete
+is appended to ``<snapshot>.log.jsonl`` as one JSON line, so a write costs
+one record instead of the whole DB.  The log starts with a ``base`` line
+carrying the snapshot's hash and the ids of its rows; a log whose base does
+not match the snapshot is stale (compaction got as far as replacing the
+snapshot) and is ignored.  A torn final line from a crash is skipped.
+"""
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from pitchdb.migrations import SCHEMA_VERSION, migrate, unwrap, wrap
+from pitchdb.snapshot import loads
+
+
+def write_atomic(path, text):
+    """Write via a temp file + rename so readers never see a partial file."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _upgrade(players, version):
+    """Migrate ``players`` in place; True if any record changed.
+
+    An old snapshot is only rewritten when this is True, so a file whose
+    records are already current (e.g. the tracked one) is left as it is.
+    """
+    if version >= SCHEMA_VERSION:
+        return False
+    before = copy.deepcopy(players)
+    migrate(players, version)
+    return players != before
+
+
+class Journal:
+    def __init__(self, path, compact_every=500):
+        self.path = Path(path)
+        self.log_path = self.path.with_name(self.path.stem + ".log.jsonl")
+        self.compact_every = compact_every
+        self.entries = 0
+        self.rows = {}     # id -> player, kept current so compaction needs no caller state
+        self._log = None
+
+    def load(self, default):
+        """Return ``(players, ids)`` from snapshot + log.
+
+        ``default()`` seeds a missing snapshot (it is written out right away).
+        """
+        if not self.path.exists():
+            players = default()
+            self.compact(players)
+            return players, list(range(len(players)))
+        text = self.path.read_text(encoding="utf-8")
+        players, version = unwrap(loads(text))
+        ids = list(range(len(players)))
+        self.rows = dict(zip(ids, players))
+        if not self.log_path.exists():
+            if _upgrade(players, version):
+                self.compact(players, ids)
+            return players, ids
+        with open(self.log_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        try:
+            base = json.loads(lines[0])
+        except (IndexError, ValueError):
+            base = {}
+        if base.get("op") != "base" or base.get("hash") != _hash(text):
+            self.log_path.unlink()
+            if _upgrade(players, version):
+                self.compact(players, ids)
+            return players, ids
+        self.rows = rows = dict(zip(base["ids"], players))
+        torn = False
+        for line in lines[1:]:
+            try:
+                e = json.loads(line)
+            except ValueError:
+                torn = True  # interrupted append; later lines can't be trusted
+                break
+            if e["op"] == "delete":
+                rows.pop(e["id"], None)
+            else:
+                rows[e["id"]] = e["p"]
+            self.entries += 1
+        ids = sorted(rows)
+        players = [rows[i] for i in ids]
+        # Log lines were written against the snapshot's schema, so they migrate with it.
+        if _upgrade(players, version) or torn:
+            self.compact(players, ids)
+        return players, ids
+
+    def apply(self, op, pid, p=None):
+        """Log one change; compacts once the log has ``compact_every`` entries."""
+        if self._log is None:
+            if not self.log_path.exists():
+                # First change since the last compaction: snapshot rows are 0..n-1.
+                text = self.path.read_text(encoding="utf-8")
+                n = len(unwrap(loads(text))[0])
+                write_atomic(self.log_path, json.dumps({"op":"base","hash":_hash(text),"ids":list(range(n))}) + "\n")
+            self._log = open(self.log_path, "a", encoding="utf-8")
+        e = {"op": op, "id": pid}
+        if p is not None:
+            e["p"] = p
+        self._log.write(json.dumps(e, ensure_ascii=False) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self.entries += 1
+        if op == "delete":
+            self.rows.pop(pid, None)
+        else:
+            self.rows[pid] = p
+        if self.entries >= self.compact_every:
+            ids = sorted(self.rows)
+            self.compact([self.rows[i] for i in ids], ids)
+
+    def compact(self, players, ids=None):
+        """Rewrite the snapshot and restart the log from it."""
+        text = json.dumps(wrap(players), ensure_ascii=False, indent=2)
+        write_atomic(self.path, text)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        ids = list(range(len(players))) if ids is None else list(ids)
+        self.rows = dict(zip(ids, players))
+        write_atomic(self.log_path, json.dumps({"op":"base","hash":_hash(text),"ids":ids}) + "\n")
+        self.entries = 0
@@ -0,0 +1,45 @@
+"""Three-way merge of record sets keyed by stable id.
+
+``base`` is the revision our local state started from, ``ours`` what we want
+to write and ``theirs`` what is stored now.  Records are ``{id: player}``;
+a missing id means the record does not exist (never created, or deleted).
+``base`` is None when the starting revision is unknown.
+"""
+
+
+def merge(base, ours, theirs):
+    """Return ``(merged, conflicts)``.
+
+    A record changed on one side only takes that side.  Changed on both
+    sides to different values it is a conflict: ``theirs`` is kept, except
+    that an edit beats a delete (the record survives either way).  Two new
+    records that got the same id are both kept, ours under a fresh id.
+    ``conflicts`` holds ``{"id", "mine", "theirs", "kept"}`` dicts.
+
+    With ``base`` None our edits cannot be told from stale copies: ``theirs``
+    is kept, and every record of ours that differs from it is a conflict.
+    """
+    if base is None:
+        conflicts = [{"id": pid, "mine": o, "theirs": theirs.get(pid), "kept": "theirs"}
+                     for pid, o in sorted(ours.items()) if o != theirs.get(pid)]
+        return dict(theirs), conflicts
+    merged, conflicts = {}, []
+    next_id = max([*base, *ours, *theirs], default=-1) + 1
+    for pid in sorted(set(base) | set(ours) | set(theirs)):
+        b, o, t = base.get(pid), ours.get(pid), theirs.get(pid)
+        if o == t or o == b:
+            p = t
+        elif t == b:
+            p = o
+        elif b is None:
+            # Both sides inserted into the same free id: keep both.
+            p = t
+            merged[next_id] = o
+            next_id += 1
+        else:
+            kept = "mine" if t is None else "theirs"
+            p = o if t is None else t
+            conflicts.append({"id": pid, "mine": o, "theirs": t, "kept": kept})
+        if p is not None:
+            merged[pid] = p
+    return merged, conflicts
@@ -0,0 +1,106 @@
+"""Schema versions and data migrations.
+
+Saved documents are ``{"schema_version": N, "players": [...]}``; a bare list
+is the pre-versioning format (version 0).  :func:`upgrade` runs only the
+steps newer than the document's version, so already-migrated data loads
+with no per-record fixups.  The ``raw_prefix`` classifier used by the
+built-in roster and the bulk importer lives here too.
+"""
+import re
+from functools import lru_cache
+
+from pitchdb.constants import IMPAC_TYPES
+
+SCHEMA_VERSION = 1
+
+# ── raw_prefix ─────────────────────────────────────────────────────────────────
+_TOKEN = re.compile(r"(\d+)|([가-힣]+)|([A-Za-z]+)")
+IMPAC_KW = frozenset(IMPAC_TYPES) | {"FA","골"}
+# keyword -> card type for prefixes that name the card type directly
+CARD_KW = {"국대": "국대", "라이브": "라이브"}
+
+
+@lru_cache(maxsize=4096)
+def parse_prefix(prefix):
+    """``raw_prefix`` -> ``(player_type, year, impac_type)``.
+
+    The first run of digits is the year, the first Hangul (else Latin) run
+    the keyword: "22" -> 시그 22, "22우에" -> 시그 22 우에, "여사" -> 임팩 여사,
+    "국대" -> 국대, "골" -> 골글, anything else -> 시그.
+    """
+    num = korean = latin = None
+    for m in _TOKEN.finditer(prefix):
+        n, k, l = m.groups()
+        if n and num is None: num = n
+        elif k and korean is None: korean = k
+        elif l and latin is None: latin = l
+    kw = korean or latin or ""
+    if prefix == "골":
+        return "골글", None, None
+    if kw in CARD_KW:
+        return CARD_KW[kw], None, None
+    if num:
+        return "시그", num, korean if korean in IMPAC_KW else None
+    if kw in IMPAC_KW or kw.upper() == "FA":
+        return "임팩", None, kw
+    return "시그", None, None
+
+
+def classify(prefixes):
+    """Batch form of :func:`parse_prefix`."""
+    return [parse_prefix(p) for p in prefixes]
+
+
+# ── Migrations ─────────────────────────────────────────────────────────────────
+# impac_type values that were really card types
+IMPAC_TO_CARD = {"국에": "국대", "라이브": "라이브"}
+
+
+def _v1_card_types(players):
+    """골글 stored as a team, and 국에/라이브 stored as impac types."""
+    for p in players:
+        if p.get("team") == "골글":
+            p["team"] = "삼성"
+            p["player_type"] = "골글"
+        card = IMPAC_TO_CARD.get(p.get("impac_type"))
+        if card:
+            p["player_type"] = card
+            p["impac_type"] = None
+
+
+MIGRATIONS = [(1, _v1_card_types)]  # (version it produces, step), ascending
+
+
+def migrate(players, version):
+    """Bring ``players`` (in place) from ``version`` up to SCHEMA_VERSION."""
+    for target, step in MIGRATIONS:
+        if version < target:
+            step(players)
+    return players
+
+
+def unwrap(doc):
+    """``(players, schema_version)`` from a saved document of any version."""
+    if isinstance(doc, list):
+        return doc, 0
+    return doc["players"], doc.get("schema_version", 0)
+
+
+def wrap(players, ids=None):
+    """Current-version document; ``ids`` (stable record ids) are stored alongside if given."""
+    doc = {"schema_version": SCHEMA_VERSION, "players": players}
+    if ids is not None:
+        doc["ids"] = list(ids)
+    return doc
+
+
+def ids_of(doc, players):
+    """Record ids saved with ``doc``, else positions (older or id-less documents)."""
+    ids = doc.get("ids") if isinstance(doc, dict) else None
+    return list(ids) if ids and len(ids) == len(players) else list(range(len(players)))
+
+
+def upgrade(doc):
+    """Saved document -> current-schema player list."""
+    players, version = unwrap(doc)
+    return migrate(players, version)
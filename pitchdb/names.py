@@ -0,0 +1,139 @@
+"""Name index: substring, 초성 (initial consonant) and fuzzy lookups.
+
+Names are decomposed into jamo (``"럼"`` -> ``"ㄹㅓㅁ"``) and each distinct name
+is posted under its jamo bigrams and its 초성 bigrams.  A lookup intersects a
+few posting sets and verifies the handful of survivors instead of scanning
+every player.  Each distinct name maps to a player bitmask, matching the
+masks in :mod:`pitchdb.index`.
+"""
+from collections import Counter
+
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG = ("", "ㄱ","ㄲ","ㄳ","ㄴ","ㄵ","ㄶ","ㄷ","ㄹ","ㄺ","ㄻ","ㄼ","ㄽ","ㄾ","ㄿ","ㅀ",
+        "ㅁ","ㅂ","ㅄ","ㅅ","ㅆ","ㅇ","ㅈ","ㅊ","ㅋ","ㅌ","ㅍ","ㅎ")
+CHO_SET = set(CHO)
+
+
+def jamo(s):
+    out = []
+    for ch in s:
+        c = ord(ch) - 0xAC00
+        if 0 <= c < 11172:
+            out.append(CHO[c // 588] + JUNG[c % 588 // 28] + JONG[c % 28])
+        else:
+            out.append(ch.lower())
+    return "".join(out)
+
+
+def chosung(s):
+    out = []
+    for ch in s:
+        c = ord(ch) - 0xAC00
+        out.append(CHO[c // 588] if 0 <= c < 11172 else ch.lower())
+    return "".join(out)
+
+
+def is_chosung(q):
+    return bool(q) and all(ch in CHO_SET or ch == " " for ch in q)
+
+
+def bigrams(s):
+    return {s[i:i+2] for i in range(len(s) - 1)}
+
+
+def substring_distance(q, s, limit=None):
+    """Edit distance from ``q`` to the best-matching substring of ``s``.
+
+    Gives up with ``limit + 1`` once every alignment is already over ``limit``.
+    """
+    prev = [0] * (len(s) + 1)
+    for i, qc in enumerate(q, 1):
+        cur = [i] + [0] * len(s)
+        for j, sc in enumerate(s, 1):
+            cur[j] = min(prev[j] + 1, cur[j-1] + 1, prev[j-1] + (qc != sc))
+        if limit is not None and min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev)
+
+
+class NameIndex:
+    def __init__(self):
+        self.masks = {}      # name -> player bitmask
+        self.jamo = {}       # name -> jamo string
+        self.cho = {}        # name -> 초성 string
+        self.jamo_grams = {} # bigram -> set of names
+        self.cho_grams = {}
+
+    def _post(self, name):
+        j, c = self.jamo[name], self.cho[name] = jamo(name), chosung(name)
+        for g in bigrams(j):
+            self.jamo_grams.setdefault(g, set()).add(name)
+        for g in bigrams(c):
+            self.cho_grams.setdefault(g, set()).add(name)
+
+    def add(self, name, pos):
+        m = self.masks.get(name, 0)
+        if not m:
+            self._post(name)
+        self.masks[name] = m | 1 << pos
+
+    def add_many(self, masks):
+        """Add ``{name: mask}`` for names not indexed yet (bulk load)."""
+        for name, m in masks.items():
+            self._post(name)
+            self.masks[name] = m
+
+    def remove(self, name, pos):
+        m = self.masks[name] & ~(1 << pos)
+        if m:
+            self.masks[name] = m
+            return
+        del self.masks[name]
+        for g in bigrams(self.jamo.pop(name)):
+            self.jamo_grams[g].discard(name)
+        for g in bigrams(self.cho.pop(name)):
+            self.cho_grams[g].discard(name)
+
+    def _candidates(self, key, postings):
+        gs = bigrams(key)
+        if not gs:
+            return self.masks.keys()  # 1-char query: nothing to intersect on
+        sets = sorted((postings.get(g, set()) for g in gs), key=len)
+        return set.intersection(*sets)
+
+    def names(self, q):
+        """Distinct names containing ``q``, or whose 초성 contain it if ``q`` is all 초성."""
+        if is_chosung(q):
+            q = q.replace(" ", "")
+            return [n for n in self._candidates(q, self.cho_grams) if q in self.cho[n]]
+        return [n for n in self._candidates(jamo(q), self.jamo_grams) if q in n]
+
+    def mask(self, q):
+        m = 0
+        for n in self.names(q):
+            m |= self.masks[n]
+        return m
+
+    def suggest(self, q, k=5, max_candidates=20):
+        """Up to ``k`` ``(name, distance)`` pairs, closest first; tolerates typos."""
+        q = q.strip()
+        if not q:
+            return []
+        if is_chosung(q):
+            return [(n, 0) for n in sorted(self.names(q), key=len)[:k]]
+        jq = jamo(q)
+        gq = bigrams(jq)
+        shared = Counter()
+        for g in gq:
+            for n in self.jamo_grams.get(g, ()):
+                shared[n] += 1
+        limit = max(1, len(jq) // 3)
+        need = len(gq) - 2 * limit  # one edit breaks at most two bigrams
+        pool = [n for n, c in shared.most_common(max_candidates) if c >= need]
+        exact = sorted((n for n in pool if jq in self.jamo[n]), key=len)
+        if len(exact) >= k:
+            return [(n, 0) for n in exact[:k]]
+        ranked = sorted((substring_distance(jq, self.jamo[n], limit), len(n), n) for n in pool if n not in exact)
+        return [(n, 0) for n in exact] + [(n, d) for d, _, n in ranked if d <= limit][:k - len(exact)]
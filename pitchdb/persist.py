@@ -0,0 +1,129 @@
+"""Write-behind persistence.
+
+Edits only mark the data dirty; a background thread coalesces everything
+that arrives within ``delay`` seconds into one save, retries failures with
+exponential backoff and does a final flush at interpreter shutdown.  When
+retries run out, or ``save`` raises one of ``fail_fast``, the data goes to
+``fallback`` instead and the fallback is counted in ``status()``.
+"""
+import atexit
+import threading
+import time
+
+
+class WriteBehind:
+    def __init__(self, save, delay=2.0, retries=4, backoff=1.0, fallback=None, fail_fast=()):
+        self.save = save            # callable(data); raises on failure
+        self.fallback = fallback    # callable(data) used once retries run out
+        self.fail_fast = tuple(fail_fast)   # exception types not worth retrying
+        self.delay = delay
+        self.retries = retries
+        self.backoff = backoff
+        self._cond = threading.Condition()
+        self._data = None
+        self._due = None
+        self._busy = False
+        self._closed = False
+        self.state = "idle"         # idle | pending | saving | retrying | fallback | failed
+        self.last_ok = None
+        self.last_error = None
+        self.writes = 0
+        self.coalesced = 0
+        self.fallbacks = 0
+        self.last_fallback = None
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def mark_dirty(self, data):
+        """Queue ``data`` (whatever ``save`` takes, e.g. players + ids) to be saved."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("persister is closed")
+            if self._data is not None:
+                self.coalesced += 1
+            self._data = data
+            if self._due is None:
+                self._due = time.monotonic() + self.delay
+            self.state = "pending"
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Write anything pending now and wait for it. Returns False on timeout."""
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._data is not None:
+                self._due = time.monotonic()
+                self._cond.notify_all()
+            while self._data is not None or self._busy:
+                left = None if end is None else end - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout=30):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def status(self):
+        with self._cond:
+            return {"state": self.state, "last_ok": self.last_ok, "last_error": self.last_error,
+                    "writes": self.writes, "coalesced": self.coalesced,
+                    "fallbacks": self.fallbacks, "last_fallback": self.last_fallback}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (self._data is None or time.monotonic() < self._due):
+                    self._cond.wait(None if self._data is None else self._due - time.monotonic())
+                if self._data is None:
+                    return  # closed and drained
+                data, self._data, self._due = self._data, None, None
+                self._busy = True
+                self.state = "saving"
+            try:
+                self._write(data)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if self._data is not None:
+                        self.state = "pending"
+                    self._cond.notify_all()
+
+    def _write(self, data):
+        for attempt in range(self.retries + 1):
+            try:
+                self.save(data)
+            except Exception as e:
+                with self._cond:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    self.state = "retrying"
+                    if attempt == self.retries or isinstance(e, self.fail_fast):
+                        break
+                    self._cond.wait(self.backoff * 2 ** attempt)
+                    if self._data is not None:
+                        return  # a newer snapshot supersedes this one
+                continue
+            with self._cond:
+                self.writes += 1
+                self.last_ok = time.time()
+                self.last_error = None
+                self.state = "idle"
+            return
+        with self._cond:
+            self.state = "failed"
+        if self.fallback:
+            try:
+                self.fallback(data)
+            except Exception:
+                return
+            with self._cond:
+                self.fallbacks += 1
+                self.last_fallback = time.time()
+                if self._data is None:
+                    self.state = "fallback"
@@ -0,0 +1,139 @@
+"""Opt-in timing for the Streamlit script and its background threads.
+
+A :class:`Profiler` is shared by the whole server process: named sections
+(load, filter, sort, render, save, gist.fetch, gist.save …) keep their last
+``window`` durations, so the sidebar can show a rolling p50/p95.  Each
+script run switches timing on or off for its own thread with ``activate``,
+so only sessions that asked for profiling add to the table; threads that
+never call it (write-behind, Gist polling) follow ``enabled``.  When timing
+is off, ``section`` is a plain pass-through.
+
+A :class:`RunTracker` lives in each session and groups script runs into
+user interactions: a run started by ``st.rerun()`` belongs to the same
+interaction as the run that requested it.  A fragment-only rerun counts as
+a run of its own; a fragment executing inside a full run is part of it.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+
+def percentile(sorted_ms, q):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_ms[min(len(sorted_ms) - 1, int(q * len(sorted_ms)))]
+
+
+class Profiler:
+    def __init__(self, window=200):
+        self.enabled = False        # for threads that never called activate()
+        self.window = window
+        self._thread = threading.local()
+        self.lock = threading.Lock()
+        self.samples = {}   # section -> deque of ms
+
+    def record(self, name, ms):
+        with self.lock:
+            d = self.samples.get(name)
+            if d is None:
+                d = self.samples[name] = deque(maxlen=self.window)
+            d.append(ms)
+
+    def activate(self, on):
+        """Time sections on the calling thread (one session's script run) or not."""
+        self._thread.on = on
+
+    @property
+    def active(self):
+        return getattr(self._thread, "on", self.enabled)
+
+    @contextmanager
+    def section(self, name):
+        if not self.active:
+            yield
+            return
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t) * 1000)
+
+    def timed(self, name, fn):
+        """``fn`` wrapped in ``section(name)`` (for callables handed to other threads)."""
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.section(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def table(self):
+        """One row per section: count, p50, p95 and last duration in ms."""
+        with self.lock:
+            samples = {k: list(v) for k, v in self.samples.items()}
+        rows = []
+        for name, ms in sorted(samples.items()):
+            s = sorted(ms)
+            rows.append({"구간": name, "n": len(ms), "p50": round(percentile(s, 0.5), 2),
+                         "p95": round(percentile(s, 0.95), 2), "최근": round(ms[-1], 2)})
+        return rows
+
+
+NULL = Profiler()   # default for components built without one; never enabled
+
+
+class RunTracker:
+    def __init__(self, window=50):
+        self.runs = 0
+        self.current = 0                    # runs in the interaction in progress
+        self.reruns = deque(maxlen=window)  # runs per finished interaction
+        self.last_profile = None            # pstats text of the last profiled run
+        self._rerun = False
+        self._start = None
+        self._cprof = None
+
+    def begin(self, cprofile=False):
+        if not self._rerun and self.current:
+            self.reruns.append(self.current)
+            self.current = 0
+        self._rerun = False
+        self.runs += 1
+        self.current += 1
+        self._start = time.perf_counter()
+        self._cprof = None
+        if cprofile:
+            import cProfile   # with pstats, only paid for by sessions that profile
+            self._cprof = cProfile.Profile()
+            self._cprof.enable()
+
+    @contextmanager
+    def fragment(self, profiler, cprofile=False, dump_dir=None):
+        """Wrap a fragment body: a run of its own unless a full run is open."""
+        if self._start is not None:
+            yield
+            return
+        self.begin(cprofile)
+        try:
+            yield
+        finally:
+            self.end(profiler, dump_dir=dump_dir)
+
+    def end(self, profiler, rerun=False, dump_dir=None):
+        """Close the run; ``rerun`` marks the next run as part of this interaction."""
+        if self._start is None:
+            return
+        profiler.record("script", (time.perf_counter() - self._start) * 1000)
+        self._start = None
+        self._rerun = rerun
+        if self._cprof is not None:
+            import io
+            import pstats
+            self._cprof.disable()
+            buf = io.StringIO()
+            pstats.Stats(self._cprof, stream=buf).sort_stats("cumulative").print_stats(25)
+            self.last_profile = buf.getvalue()
+            if dump_dir:
+                Path(dump_dir).mkdir(parents=True, exist_ok=True)
+                self._cprof.dump_stats(Path(dump_dir) / f"run-{time.strftime('%Y%m%d-%H%M%S')}-{self.runs}.prof")
+            self._cprof = None
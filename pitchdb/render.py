@@ -0,0 +1,56 @@
+"""Player card HTML with an LRU memo keyed by (player id, record version)."""
+from collections import OrderedDict
+
+from pitchdb.constants import PITCH_TYPES, TYPE_CFG
+
+PITCH_ORDER = {pt:i for i,pt in enumerate(PITCH_TYPES)}
+
+
+def pitch_badge(pitch):
+    return f'<span class="pitch-badge pitch-{pitch}">{pitch}</span>'
+
+
+def player_card_html(p):
+    ordered = sorted(p.get("pitches", []), key=lambda x: PITCH_ORDER.get(x, 99))
+    pitches_html = "".join(pitch_badge(pt) for pt in ordered)
+    ptype = p.get("player_type","")
+    bg, fg = TYPE_CFG.get(ptype, ("#374151","#d1d5db"))
+    type_b = f'<span class="pitch-badge" style="background:{bg};color:{fg};">{ptype}</span>'
+    extra = ""
+    if p.get("year"):
+        extra += f'<span class="pitch-badge" style="background:#1e3a5f;color:#60a5fa;">{p["year"]}</span>'
+    if p.get("impac_type"):
+        extra += f'<span class="pitch-badge" style="background:#16a34a;color:white;">{p["impac_type"]}</span>'
+    meta = f'팀: {p["team"]} · 역할: {p["role"]}'
+    return f"""<div class="player-card">
+        <div class="player-name">{p['name']}</div>
+        <div style="margin:6px 0">{type_b}{extra}</div>
+        <div class="player-meta" style="margin-bottom:8px">{meta}</div>
+        <div>{pitches_html}</div>
+    </div>"""
+
+
+def section_html(title, count):
+    return f'<div class="section-title">{title} <span class="count-chip">{count}</span></div>'
+
+
+class CardCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.memo = OrderedDict()
+
+    def card(self, repo, pid):
+        key = (pid, repo.version(pid))
+        html = self.memo.get(key)
+        if html is None:
+            html = self.memo[key] = player_card_html(repo.get(pid))
+            if len(self.memo) > self.maxsize:
+                self.memo.popitem(last=False)
+        else:
+            self.memo.move_to_end(key)
+        return html
+
+
+def chunked(parts, size=100):
+    """Join HTML fragments into payloads of at most ``size`` fragments each."""
+    return ["".join(parts[i:i+size]) for i in range(0, len(parts), size)]
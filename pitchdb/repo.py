@@ -0,0 +1,75 @@
+"""Player repository with stable integer ids.
+
+A player's id is its row in the index's :class:`PlayerTable`; deletes leave a hole
+instead of shifting later players, so every derived structure can be
+patched in place rather than rebuilt.
+"""
+from pitchdb.index import PlayerIndex, iter_bits
+from pitchdb.sorting import SORT_KEYS, SortOrder
+
+
+class PlayerRepo:
+    def __init__(self, players=(), ids=None):
+        self.index = PlayerIndex()
+        self.orders = {mode: SortOrder(key) for mode, key in SORT_KEYS.items()}
+        self.versions = {}
+        self.clock = 0   # last version handed out; versions are never reused
+        items = list(zip(ids or range(len(players)), players))
+        # Bulk build: one sort per order and one pass per mask instead of per-record inserts.
+        self.index.add_many(items)
+        for o in self.orders.values():
+            o.add_many(items)
+        for pid, _ in items:
+            self._stamp(pid)
+
+    def __len__(self):
+        return self.index.all.bit_count()
+
+    def get(self, pid):
+        """Read-only dict-like view of the player; ``dict()`` it to keep a snapshot."""
+        return self.index.table[pid]
+
+    def version(self, pid):
+        """Changes on every write to ``pid`` and is never reused, even after a
+        delete and re-insert at the same id; lets caches key on (id, version)."""
+        return self.versions[pid]
+
+    def _stamp(self, pid):
+        self.clock += 1
+        self.versions[pid] = self.clock
+
+    def ids(self, mask=None):
+        return list(iter_bits(self.index.all if mask is None else mask))
+
+    def sorted_ids(self, mode, mask, start=0, stop=None):
+        """Ids in ``mask`` ordered by sort mode ``mode`` (a key of SORT_KEYS)."""
+        return self.orders[mode].select(mask, len(self), start, stop)
+
+    def insert(self, p, pid=None):
+        pid = self.index.add(p, pid)
+        self._stamp(pid)
+        for o in self.orders.values():
+            o.add(pid, p)
+        return pid
+
+    def update(self, pid, p):
+        if self.index.table[pid] is None:
+            raise KeyError(pid)
+        self.index.replace(pid, p)
+        self._stamp(pid)
+        for o in self.orders.values():
+            o.remove(pid)
+            o.add(pid, p)
+
+    def delete(self, pid):
+        if self.index.table[pid] is None:
+            raise KeyError(pid)
+        self.index.remove(pid)
+        del self.versions[pid]
+        for o in self.orders.values():
+            o.remove(pid)
+
+    def to_list(self):
+        """Live players in id order — the list that gets persisted."""
+        t = self.index.table
+        return [t.to_dict(pid) for pid in iter_bits(self.index.all)]
@@ -0,0 +1,39 @@
+"""Pitch-arsenal similarity over the table's 10-bit pitch masks."""
+import heapq
+import math
+
+from pitchdb.constants import PITCH_TYPES
+from pitchdb.index import iter_bits
+
+N_MASKS = 1 << len(PITCH_TYPES)
+POPCOUNT = [m.bit_count() for m in range(N_MASKS)]
+
+
+def pitch_weights(index):
+    """IDF-style weight per pitch bit: rarer pitches count for more."""
+    n = max(1, index.all.bit_count())
+    return [math.log((n + 1) / ((index.pitch_bits.get(pt, 0) & index.all).bit_count() + 1)) + 1.0
+            for pt in PITCH_TYPES]
+
+
+def weight_table(weights):
+    """Sum of ``weights`` over the set bits, for every mask."""
+    out = [0.0] * N_MASKS
+    for m in range(1, N_MASKS):
+        low = m & -m
+        out[m] = out[m ^ low] + weights[low.bit_length() - 1]
+    return out
+
+
+def similar(table, candidates, query, k=10, weights=None, exclude=None):
+    """Top-``k`` ``(score, pos)`` among rows in the ``candidates`` mask.
+
+    Without ``weights`` the score is Jaccard over pitch sets; with a
+    :func:`weight_table` it is weighted overlap (weighted Jaccard).  The
+    score only depends on the row's mask, so it is computed once per mask.
+    """
+    sizes = POPCOUNT if weights is None else weights
+    score = [sizes[m & query] / sizes[m | query] if sizes[m | query] else 0.0 for m in range(N_MASKS)]
+    pitches = table.pitches
+    scored = ((score[pitches[pos]], pos) for pos in iter_bits(candidates) if pos != exclude)
+    return heapq.nlargest(k, scored, key=lambda t: (t[0], -t[1]))
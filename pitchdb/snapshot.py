@@ -0,0 +1,89 @@
+"""Text formats for a saved document (:func:`pitchdb.migrations.wrap`).
+
+``pretty``  indented JSON, as the app has always written it.
+``dict``    minified JSON, one column per field.  Categorical values are
+            stored once in a header and the columns hold indexes into it::
+
+                {"schema_version": 1, "format": "dict", "dict": {field: [value, ...]},
+                 "columns": {field: [...]}, "extra": [[row, {...}], ...], "ids": [...]}
+
+            ``name`` stays a string, ``pitches`` is a list of indexes per
+            player and ``extra`` holds the rare keys outside the usual fields.
+``gzip``    the ``dict`` text gzipped and base64-encoded (Gist files are text).
+
+:func:`loads` detects the format itself and always returns the plain
+``{"schema_version", "players", "ids"?}`` document (or an old bare list).
+"""
+import base64
+import gzip
+import json
+
+from pitchdb.table import KEYS
+
+FORMATS = ("pretty", "dict", "gzip")
+CODED = ("team", "role", "raw_prefix", "player_type", "year", "impac_type", "pitches")
+
+
+def _encode(doc):
+    players = doc["players"]
+    vocab = {f: {} for f in CODED}
+    columns = {}
+    for f in KEYS:
+        if f == "name":
+            columns[f] = [p.get(f, "") for p in players]
+        elif f == "pitches":
+            codes = vocab[f]
+            columns[f] = [[codes.setdefault(pt, len(codes)) for pt in p.get(f, [])] for p in players]
+        else:
+            codes = vocab[f]
+            columns[f] = [codes.setdefault(p.get(f), len(codes)) for p in players]
+    extra = [[i, e] for i, p in enumerate(players) if (e := {k: v for k, v in p.items() if k not in KEYS})]
+    out = {k: v for k, v in doc.items() if k != "players"}
+    out.update(format="dict", dict={f: list(vocab[f]) for f in CODED}, columns=columns)
+    if extra:
+        out["extra"] = extra
+    return out
+
+
+def _decode(doc):
+    vocab, columns = doc["dict"], doc["columns"]
+    cols = []
+    for f, col in columns.items():
+        if f == "pitches":
+            get = vocab[f].__getitem__
+            col = [list(map(get, codes)) for codes in col]
+        elif f in vocab:
+            col = list(map(vocab[f].__getitem__, col))
+        cols.append(col)
+    fields = list(columns)
+    players = [dict(zip(fields, values)) for values in zip(*cols)]
+    for i, e in doc.get("extra", ()):
+        players[i].update(e)
+    out = {k: v for k, v in doc.items() if k not in ("format", "dict", "columns", "extra")}
+    out["players"] = players
+    return out
+
+
+def dumps(doc, fmt="pretty"):
+    """``doc`` as text in one of :data:`FORMATS`."""
+    if fmt == "pretty":
+        return json.dumps(doc, ensure_ascii=False, indent=2)
+    if isinstance(doc, dict):
+        doc = _encode(doc)
+    text = json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+    if fmt == "dict":
+        return text
+    if fmt == "gzip":
+        return base64.b64encode(gzip.compress(text.encode("utf-8"), compresslevel=6, mtime=0)).decode("ascii")
+    raise ValueError(f"unknown snapshot format {fmt!r}")
+
+
+def loads(text):
+    """Document from text in any of :data:`FORMATS`."""
+    text = text.strip()
+    if text[:1] not in ("{", "["):
+        text = gzip.decompress(base64.b64decode(text)).decode("utf-8")
+    doc = json.loads(text)
+    if isinstance(doc, dict) and doc.get("format") == "dict":
+        return _decode(doc)
+    return doc
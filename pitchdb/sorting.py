@@ -0,0 +1,60 @@
+"""Persistent sort orders for the 🔍 검색 result list.
+
+Each mode keeps its (key, id) pairs sorted with ``bisect``, so a rerun only
+has to walk the order and keep the ids that are set in the filter mask.
+Ties fall back to id order, matching a stable sort of the persisted list.
+"""
+from bisect import bisect_left, insort
+from itertools import islice
+
+from pitchdb.constants import TEAMS
+from pitchdb.index import iter_bits
+
+TEAM_ORDER = {t:i for i,t in enumerate(TEAMS)}
+ROLE_ORDER = {"선발":0,"중계":1,"마무리":2}
+TYPE_ORDER = {"골글":0,"시그":1,"임팩":2}
+
+SORT_KEYS = {
+    "팀순": lambda p: (TEAM_ORDER.get(p["team"],99), ROLE_ORDER.get(p["role"],99)),
+    "이름순": lambda p: p["name"],
+    "카드종류순": lambda p: (TYPE_ORDER.get(p.get("player_type",""),99), TEAM_ORDER.get(p["team"],99)),
+    "역할순": lambda p: (ROLE_ORDER.get(p["role"],99), TEAM_ORDER.get(p["team"],99)),
+}
+
+
+class SortOrder:
+    def __init__(self, key):
+        self.key = key
+        self.keys = {}    # id -> sort key
+        self.order = []   # sorted (sort key, id)
+
+    def add_many(self, items):
+        """Fill an empty order from ``(id, player)`` pairs with one sort."""
+        self.keys = {pid: self.key(p) for pid, p in items}
+        self.order = sorted((k, pid) for pid, k in self.keys.items())
+
+    def add(self, pid, p):
+        k = self.key(p)
+        self.keys[pid] = k
+        insort(self.order, (k, pid))
+
+    def remove(self, pid):
+        k = self.keys.pop(pid)
+        del self.order[bisect_left(self.order, (k, pid))]
+
+    def select(self, mask, size, start=0, stop=None):
+        """Ids set in ``mask`` in sort order, sliced to ``[start:stop]``.
+
+        ``size`` is the live player count.  When nothing is filtered out the
+        slice comes straight off the order, so a page costs O(page size).
+        """
+        n = mask.bit_count()
+        if n == size:
+            return [pid for _, pid in self.order[start:stop]]
+        if n * 16 < size:
+            # Few hits: sorting them by the stored key beats walking everything.
+            return sorted(iter_bits(mask), key=lambda i: (self.keys[i], i))[start:stop]
+        b = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        nb = len(b)
+        hits = (pid for _, pid in self.order if pid >> 3 < nb and b[pid >> 3] >> (pid & 7) & 1)
+        return list(islice(hits, start, stop))
@@ -0,0 +1,51 @@
+"""Pitch distribution statistics straight from the index bitsets.
+
+Every cell is one popcount of an AND of two masks, so the whole set of
+tables costs a few hundred big-int operations regardless of roster size.
+"""
+from pitchdb.constants import IMPAC_TYPES, PITCH_TYPES, ROLES, TEAMS, TYPE_CFG
+
+GROUPS = {"team": TEAMS, "role": ROLES, "player_type": list(TYPE_CFG)}
+
+
+def _labels(index, field, known):
+    present = [v for v, m in index.bits[field].items() if m & index.all and v is not None]
+    return list(known) + sorted(v for v in present if v not in known)
+
+
+def crosstab(index, field):
+    """``(rows, sizes, matrix)``: pitch counts per value of ``field``.
+
+    ``sizes[i]`` is the number of players with ``rows[i]`` and ``matrix[i][j]``
+    how many of them throw ``PITCH_TYPES[j]``.
+    """
+    rows = _labels(index, field, GROUPS[field])
+    bits = index.bits[field]
+    pitch = [index.pitch_bits.get(pt, 0) & index.all for pt in PITCH_TYPES]
+    sizes, matrix = [], []
+    for v in rows:
+        g = bits.get(v, 0) & index.all
+        sizes.append(g.bit_count())
+        matrix.append([(g & pm).bit_count() for pm in pitch])
+    return rows, sizes, matrix
+
+
+def cooccurrence(index):
+    """``matrix[i][j]`` = players throwing both ``PITCH_TYPES[i]`` and ``[j]``."""
+    pitch = [index.pitch_bits.get(pt, 0) & index.all for pt in PITCH_TYPES]
+    return [[(a & b).bit_count() for b in pitch] for a in pitch]
+
+
+def impac_counts(index):
+    counts = index.counts("impac_type", index.all)
+    return {t: counts.get(t, 0) for t in _labels(index, "impac_type", IMPAC_TYPES)}
+
+
+def all_stats(repo):
+    index = repo.index
+    return {
+        "total": index.all.bit_count(),
+        "by": {f: crosstab(index, f) for f in GROUPS},
+        "cooccurrence": cooccurrence(index),
+        "impac": impac_counts(index),
+    }
@@ -0,0 +1,283 @@
+"""Storage backends.
+
+Whole-list backends implement ``load``/``save`` and are written through the
+write-behind queue.  Record-level backends set ``incremental = True`` and
+also get every change as ``apply(op, id, player)`` straight from the store.
+``load`` returns ``(players, ids)``; ids are the stable repo ids.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from pitchdb.journal import Journal, write_atomic
+from pitchdb.merge import merge
+from pitchdb.migrations import SCHEMA_VERSION, ids_of, migrate, upgrade, wrap
+from pitchdb.snapshot import dumps, loads
+from pitchdb.table import canonical
+
+GIST_FILE = "pitcher_data.json"
+
+
+class Storage:
+    incremental = False
+
+    def load(self):
+        raise NotImplementedError
+
+    def save(self, players, ids=None):
+        raise NotImplementedError
+
+    def apply(self, op, pid, p=None):
+        raise NotImplementedError
+
+    def apply_many(self, changes):
+        """``changes`` is a list of ``(op, id, player)``."""
+        for op, pid, p in changes:
+            self.apply(op, pid, p)
+
+
+class JSONStorage(Storage):
+    """One JSON file (any :mod:`pitchdb.snapshot` format); the first readable/writable path wins."""
+
+    def __init__(self, paths, fmt="pretty"):
+        self.paths = [Path(p) for p in paths]
+        self.fmt = fmt
+
+    def load(self):
+        for path in self.paths:
+            if path.exists():
+                try:
+                    players = upgrade(loads(path.read_text(encoding="utf-8")))
+                    return players, list(range(len(players)))
+                except Exception:
+                    continue
+        raise FileNotFoundError(self.paths[0])
+
+    def save(self, players, ids=None):
+        for path in self.paths:
+            try:
+                write_atomic(path, dumps(wrap(players), self.fmt))
+                return
+            except Exception:
+                continue
+        raise OSError("no writable data file")
+
+
+class JournalStorage(Storage):
+    """JSON snapshot + append-only change log (see :mod:`pitchdb.journal`)."""
+    incremental = True
+
+    def __init__(self, path, compact_every=500, seed=None):
+        self.journal = Journal(path, compact_every)
+        self.seed = seed   # callable() -> players, used when the snapshot is missing
+
+    def load(self):
+        return self.journal.load(self.seed)
+
+    def save(self, players, ids=None):
+        self.journal.compact(players, ids)
+
+    def apply(self, op, pid, p=None):
+        self.journal.apply(op, pid, p)
+
+
+class GistStorage(Storage):
+    """One file of a Gist, saved with fetch-merge-write.
+
+    ``base`` is the revision the local store was built from.  ``save`` first
+    fetches the current revision and three-way merges (see
+    :mod:`pitchdb.merge`), so edits made elsewhere since ``base`` are kept;
+    ``on_rebase(changes, ours, conflicts)`` then hands what the merge changed
+    relative to our upload back to the store.  The Gist API has no
+    conditional PATCH, so a write landing between our GET and PATCH can
+    still be lost; the window is one round trip instead of the whole
+    editing session.  HTTP and polling go through ``sync``, the
+    :class:`~pitchdb.sync.GistSync` shared by every file of the Gist;
+    uploads are written in ``fmt`` and downloads of any format are read.
+    """
+    def __init__(self, sync, file=GIST_FILE, fmt="dict"):
+        self.sync = sync
+        self.file = file           # this dataset's file; other files in the Gist are untouched
+        self.fmt = fmt
+        self.base = None           # id -> player as last loaded/saved; None = unknown
+        self.on_rebase = None
+
+    def fetch(self):
+        """Current content of our file (an empty document until the first save creates it)."""
+        text = self.sync.text(self.file)
+        return json.dumps(wrap([])) if text is None else text
+
+    def file_names(self):
+        return self.sync.files()
+
+    def load(self):
+        raw = self.fetch()
+        self.sync.note_seen(self.file, raw)
+        return self.accept(loads(raw))
+
+    def watch(self, apply):
+        """Hand ``apply(doc)`` each remote change to our file (see :meth:`GistSync.poll`)."""
+        self.sync.watch(self.file, apply)
+
+    def accept(self, doc):
+        """``(players, ids)`` of a fetched document, which becomes the new base."""
+        players = upgrade(doc)
+        ids = ids_of(doc, players)
+        self.base = dict(zip(ids, canonical(players)))
+        return players, ids
+
+    def save(self, players, ids=None):
+        ids = list(range(len(players))) if ids is None else list(ids)
+        ours = dict(zip(ids, players))
+        doc = loads(self.fetch())
+        current = upgrade(doc)
+        theirs = dict(zip(ids_of(doc, current), canonical(current)))
+        # Never loaded (started from local files): no base, so local differences come back as conflicts.
+        merged, conflicts = merge(self.base, ours, theirs)
+        merged_ids = sorted(merged)
+        payload = dumps(wrap([merged[i] for i in merged_ids], merged_ids), self.fmt)
+        self.sync.patch(self.file, payload)
+        self.base = merged
+        changes = [(i, merged.get(i)) for i in sorted(set(ours) | set(merged)) if merged.get(i) != ours.get(i)]
+        if (changes or conflicts) and self.on_rebase:
+            self.on_rebase(changes, ours, conflicts)
+
+
+# ── SQLite ─────────────────────────────────────────────────────────────────────
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id          INTEGER PRIMARY KEY,
+    team        TEXT,
+    role        TEXT,
+    raw_prefix  TEXT,
+    name        TEXT NOT NULL,
+    player_type TEXT,
+    year,
+    impac_type  TEXT,
+    extra       TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_players_team        ON players(team);
+CREATE INDEX IF NOT EXISTS ix_players_role        ON players(role);
+CREATE INDEX IF NOT EXISTS ix_players_player_type ON players(player_type);
+CREATE INDEX IF NOT EXISTS ix_players_impac_type  ON players(impac_type);
+CREATE INDEX IF NOT EXISTS ix_players_year        ON players(year);
+CREATE TABLE IF NOT EXISTS player_pitches (
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    pos       INTEGER NOT NULL,
+    pitch     TEXT NOT NULL,
+    PRIMARY KEY (player_id, pos)
+);
+CREATE INDEX IF NOT EXISTS ix_player_pitches_pitch ON player_pitches(pitch, player_id);
+"""
+COLUMNS = ("team", "role", "raw_prefix", "name", "player_type", "year", "impac_type")
+
+
+class SQLiteStorage(Storage):
+    """One row per player plus a player_pitches join table; writes are per record."""
+    incremental = True
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SQLITE_SCHEMA)
+
+    def load(self):
+        with self.lock:
+            version = self.db.execute("PRAGMA user_version").fetchone()[0]
+            rows = self.db.execute(f"SELECT id, {', '.join(COLUMNS)}, extra FROM players ORDER BY id").fetchall()
+            pitches = {}
+            for pid, pitch in self.db.execute("SELECT player_id, pitch FROM player_pitches ORDER BY player_id, pos"):
+                pitches.setdefault(pid, []).append(pitch)
+        players, ids = [], []
+        for r in rows:
+            p = dict(zip(COLUMNS, r[1:8]))
+            p["pitches"] = pitches.get(r[0], [])
+            if r[8]:
+                p.update(json.loads(r[8]))
+            players.append(p)
+            ids.append(r[0])
+        if version < SCHEMA_VERSION:
+            # Older rows (or a fresh DB): migrate once and stamp user_version.
+            self.save(migrate(players, version), ids)
+        return players, ids
+
+    def _write(self, pid, p):
+        extra = {k: v for k, v in p.items() if k not in COLUMNS and k != "pitches"}
+        self.db.execute(f"INSERT OR REPLACE INTO players (id, {', '.join(COLUMNS)}, extra) VALUES ({', '.join('?' * (len(COLUMNS) + 2))})",
+                        (pid, *(p.get(c) for c in COLUMNS), json.dumps(extra, ensure_ascii=False) if extra else None))
+        self.db.execute("DELETE FROM player_pitches WHERE player_id = ?", (pid,))
+        self.db.executemany("INSERT INTO player_pitches (player_id, pos, pitch) VALUES (?, ?, ?)",
+                            [(pid, i, pt) for i, pt in enumerate(p.get("pitches", []))])
+
+    def save(self, players, ids=None):
+        with self.lock:
+            self.db.execute("BEGIN")
+            try:
+                self.db.execute("DELETE FROM players")
+                for pid, p in zip(ids or range(len(players)), players):
+                    self._write(pid, p)
+                self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def apply(self, op, pid, p=None):
+        self.apply_many([(op, pid, p)])
+
+    def apply_many(self, changes):
+        with self.lock:
+            self.db.execute("BEGIN")
+            try:
+                for op, pid, p in changes:
+                    if op == "delete":
+                        self.db.execute("DELETE FROM players WHERE id = ?", (pid,))
+                    else:
+                        self._write(pid, p)
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def query(self, name="", team=(), role=(), player_type=(), impac_type=(), pitches=(), year=""):
+        """Same filters as PlayerIndex.query, evaluated by SQLite; returns ids."""
+        where, args = [], []
+        for col, values in (("team", team), ("role", role), ("player_type", player_type), ("impac_type", impac_type)):
+            if values:
+                where.append(f"{col} IN ({', '.join('?' * len(values))})")
+                args.extend(values)
+        if year:
+            where.append("CAST(year AS TEXT) = ?")
+            args.append(year)
+        if name:
+            where.append("instr(name, ?) > 0")
+            args.append(name)
+        pitches = list(dict.fromkeys(pitches))
+        if pitches:
+            where.append(f"id IN (SELECT player_id FROM player_pitches WHERE pitch IN ({', '.join('?' * len(pitches))})"
+                         " GROUP BY player_id HAVING COUNT(DISTINCT pitch) = ?)")
+            args.extend(pitches)
+            args.append(len(pitches))
+        sql = "SELECT id FROM players" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY id"
+        with self.lock:
+            return [r[0] for r in self.db.execute(sql, args)]
+
+
+def import_json(src, db_path):
+    """Load a pitcher_data.json document (any schema version) into a (new or existing) SQLite DB."""
+    players = upgrade(loads(Path(src).read_text(encoding="utf-8")))
+    SQLiteStorage(db_path).save(players)
+    return len(players)
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Import pitcher_data.json into a SQLite database.")
+    ap.add_argument("src", nargs="?", default="pitcher_data.json")
+    ap.add_argument("db", nargs="?", default="pitcher_data.db")
+    a = ap.parse_args()
+    print(f"{import_json(a.src, a.db)} players → {a.db}")
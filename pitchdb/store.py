@@ -0,0 +1,186 @@
+"""Process-wide player store shared by every Streamlit session.
+
+Sessions read ``store.repo`` directly instead of holding their own copy,
+under ``store.lock``.  ``repo.get`` returns live row views, so code that
+keeps a player across a rerun should copy it with ``dict()`` first.
+
+Writes can be made conditional on the record version a form was filled
+from (``expected``); a stale one raises :class:`Conflict` instead of
+silently overwriting another session's edit.
+
+An incremental backend is written through on every change.  A failed
+write does not undo the edit (it is already visible to every session);
+it shows in :meth:`SharedStore.status` and the next write saves the whole
+list instead of just its own change.
+"""
+import threading
+import time
+
+from pitchdb.profiling import NULL
+from pitchdb.render import CardCache
+from pitchdb.repo import PlayerRepo
+
+
+class Conflict(Exception):
+    """The record changed since ``expected``; ``current`` is its value now."""
+    def __init__(self, pid, current):
+        super().__init__(pid)
+        self.pid = pid
+        self.current = current
+
+
+class SharedStore:
+    def __init__(self, players, ids=None, backend=None, persist=None, profiler=NULL):
+        self.lock = threading.RLock()
+        self.repo = PlayerRepo(players, ids)
+        self.cards = CardCache()
+        self.version = 0              # bumped on every write
+        self._memo = {}               # name -> (version, value)
+        self.backend = backend        # incremental Storage: gets every change as it happens
+        self.persist = persist        # callable(list of players) for whole-list backends
+        self.profiler = profiler      # times the script-side part of each write as "save"
+        self.conflicts = []           # unresolved merge conflicts from the backend
+        self.last_ok = None           # write-through results for an incremental backend
+        self.last_error = None
+        self.writes = 0
+        self._resave = False          # the backend missed a change: save everything next time
+
+    def _changed(self, op, pid, p=None):
+        self._save([(op, pid, p)])
+
+    def _save(self, changes):
+        """Bump the version and persist ``changes`` (``(op, id, player)`` tuples)."""
+        self.version += 1
+        with self.profiler.section("save"):
+            if self.backend is not None and self.backend.incremental:
+                self._write_through(changes)
+            if self.persist:
+                self.persist(self.repo.to_list(), self.repo.ids())
+
+    def _write_through(self, changes):
+        try:
+            if self._resave:
+                self.backend.save(self.repo.to_list(), self.repo.ids())
+            else:
+                self.backend.apply_many(changes)
+        except Exception as e:
+            self._resave = True
+            self.last_error = f"{type(e).__name__}: {e}"
+            return
+        self._resave = False
+        self.writes += 1
+        self.last_ok = time.time()
+        self.last_error = None
+
+    def status(self):
+        """Write-through state of an incremental backend, keyed like ``WriteBehind.status()``."""
+        with self.lock:
+            return {"state": "failed" if self._resave else "idle", "last_ok": self.last_ok,
+                    "last_error": self.last_error, "writes": self.writes, "coalesced": 0,
+                    "fallbacks": 0, "last_fallback": None}
+
+    def insert(self, p):
+        with self.lock:
+            pid = self.repo.insert(p)
+            self._changed("insert", pid, p)
+        return pid
+
+    def insert_many(self, players):
+        """Insert a batch as one change: one version bump, one save."""
+        with self.lock:
+            pids = [self.repo.insert(p) for p in players]
+            self._save([("insert", pid, p) for pid, p in zip(pids, players)])
+        return pids
+
+    def _check(self, pid, expected):
+        if expected is not None and self.repo.get(pid) is not None and self.repo.version(pid) != expected:
+            raise Conflict(pid, dict(self.repo.get(pid)))
+
+    def update(self, pid, p, expected=None):
+        """Replace record ``pid``; with ``expected``, only if it is still at that version."""
+        with self.lock:
+            self._check(pid, expected)
+            self.repo.update(pid, p)
+            self._changed("update", pid, p)
+
+    def delete(self, pid, expected=None):
+        with self.lock:
+            self._check(pid, expected)
+            self.repo.delete(pid)
+            self._changed("delete", pid)
+
+    def _put(self, pid, p):
+        """Make record ``pid`` equal ``p`` (None deletes); True if anything changed."""
+        cur = self.repo.get(pid)
+        if p is None:
+            if cur is None:
+                return False
+            self.repo.delete(pid)
+        elif cur is None:
+            self.repo.insert(p, pid)
+        elif cur != p:
+            self.repo.update(pid, p)
+        else:
+            return False
+        return True
+
+    def apply_remote(self, players, ids=None):
+        """Bring the repo in line with a freshly fetched player list.
+
+        Records are matched by id (by position when ``ids`` is None), so
+        unchanged players keep their version and cached card; nothing is
+        persisted since the data came from there.
+        """
+        with self.lock:
+            live = self.repo.ids()
+            if ids is None:
+                start = len(self.repo.index.table)   # next unused id
+                ids = live[:len(players)] + list(range(start, start + len(players) - len(live)))
+            remote = dict(zip(ids, players))
+            changed = False
+            for pid in sorted(set(live) | set(remote)):
+                changed |= self._put(pid, remote.get(pid))
+            if changed:
+                self.version += 1
+        return changed
+
+    def rebased(self, changes, ours, conflicts):
+        """Take in a backend merge: ``changes`` are ``(id, player or None)``
+        relative to ``ours``, the snapshot that was uploaded.
+
+        Records edited again locally since that snapshot are left alone; the
+        next save merges them.  Conflicts are kept for the UI to resolve.
+        """
+        with self.lock:
+            changed = False
+            for pid, p in changes:
+                cur, sent = self.repo.get(pid), ours.get(pid)
+                if (cur is None) if sent is None else (cur is not None and cur == sent):
+                    changed |= self._put(pid, p)
+            if changed:
+                self.version += 1
+            self.conflicts.extend(conflicts)
+
+    def resolve(self, conflict, use):
+        """Settle a merge conflict with the ``"mine"`` or ``"theirs"`` value."""
+        with self.lock:
+            if conflict not in self.conflicts:
+                return  # settled by another session
+            self.conflicts.remove(conflict)
+            if use == conflict["kept"]:
+                return
+            pid, p = conflict["id"], conflict[use]
+            if self._put(pid, p):
+                self._changed("delete" if p is None else "update", pid, p)
+
+    def cached(self, name, compute):
+        """``compute(repo)``, recomputed only after the data version moves."""
+        with self.lock:
+            hit = self._memo.get(name)
+            if hit is None or hit[0] != self.version:
+                hit = self._memo[name] = (self.version, compute(self.repo))
+            return hit[1]
+
+    def card(self, pid):
+        with self.lock:
+            return self.cards.card(self.repo, pid)
@@ -0,0 +1,132 @@
+"""Conditional Gist polling, one poller per Gist.
+
+Every dataset file in a Gist shares one :class:`GistSync`.  It keeps the
+last ``GET /gists/{id}`` and finds new revisions through
+``/commits?per_page=1`` with an ETag, so an unchanged Gist costs one 304.
+The Gist is downloaded again only when the newest revision differs from
+the copy held (our own PATCH responses update it in place).  Files the API
+truncates are fetched from their ``raw_url``, which is fixed per content.
+
+Watchers are called for their own file only, and only when its content
+differs from what they last saw or saved.
+"""
+import hashlib
+import threading
+
+from pitchdb.profiling import NULL
+from pitchdb.snapshot import loads
+
+
+def content_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class GistSync:
+    def __init__(self, client, interval=30.0, profiler=NULL):
+        self.client = client        # GistClient for this Gist
+        self.interval = interval
+        self.profiler = profiler    # times each round trip as gist.fetch / gist.save
+        self.lock = threading.RLock()
+        self.meta = None            # last Gist JSON (files, history …)
+        self.etag = None
+        self.version = None         # newest revision according to /commits
+        self.commits_etag = None
+        self.raw = {}               # file -> (raw_url, text) of a truncated file
+        self.seen = {}              # file -> hash of the content last applied/saved
+        self.watchers = {}          # file -> apply(doc)
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _get(self, url=None, etag=None):
+        with self.profiler.section("gist.fetch"):
+            r = self.client.get(url=url, headers={"If-None-Match": etag} if etag else None)
+        if r.status_code not in (200, 304):
+            raise RuntimeError(f"Gist GET {r.status_code}")
+        return r
+
+    def _held_version(self):
+        history = (self.meta or {}).get("history") or [{}]
+        return history[0].get("version")
+
+    def current(self):
+        """Metadata of the newest revision; downloaded only if it changed."""
+        with self.lock:
+            r = self._get(f"{self.client.url}/commits?per_page=1", self.commits_etag)
+            if r.status_code == 200:
+                commits = r.json()
+                self.commits_etag = r.headers.get("ETag")
+                self.version = commits[0]["version"] if commits else None
+            if self.meta is None or self.version is None or self._held_version() != self.version:
+                r = self._get(etag=self.etag if self.meta else None)
+                if r.status_code == 200:
+                    self.meta, self.etag = r.json(), r.headers.get("ETag")
+            return self.meta
+
+    def files(self):
+        return list(self.current()["files"])
+
+    def text(self, file, fresh=True):
+        """Content of ``file`` in the newest (``fresh``) or held revision; None if absent."""
+        with self.lock:
+            meta = self.current() if fresh or self.meta is None else self.meta
+            f = meta["files"].get(file)
+            if f is None:
+                return None
+            if not f.get("truncated"):
+                return f["content"]
+            url = f["raw_url"]
+            if self.raw.get(file, (None,))[0] != url:
+                r = self._get(url)
+                self.raw[file] = (url, r.text)
+            return self.raw[file][1]
+
+    def patch(self, file, text):
+        """Write one file; the response becomes the held revision."""
+        with self.lock:
+            with self.profiler.section("gist.save"):
+                r = self.client.patch(json={"files": {file: {"content": text}}})
+            if r.status_code != 200:
+                raise RuntimeError(f"Gist PATCH {r.status_code}")
+            self.meta, self.etag = r.json(), None
+            self.version = self._held_version()
+            self.note_seen(file, text)
+
+    def note_seen(self, file, text):
+        """Record content we loaded or uploaded ourselves so polls skip it."""
+        self.seen[file] = content_hash(text)
+
+    def poll(self):
+        """Call each watcher whose file changed since it last saw it.
+
+        ``apply(doc)`` may return False to get the same content again next poll.
+        """
+        due = []
+        with self.lock:
+            self.current()
+            for file, apply in self.watchers.items():
+                text = self.text(file, fresh=False)
+                if text is not None and content_hash(text) != self.seen.get(file):
+                    due.append((file, apply, text))
+        for file, apply, text in due:
+            if apply(loads(text)) is not False:
+                self.note_seen(file, text)
+
+    def watch(self, file, apply):
+        """Poll every ``interval`` seconds (one thread per Gist) and hand ``file`` changes to ``apply``."""
+        with self.lock:
+            self.watchers[file] = apply
+            if self._thread:
+                return
+        def run():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.poll()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+        self._thread = threading.Thread(target=run, name="gist-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,173 @@
+"""Columnar player table.
+
+Categorical fields are stored as ``array('H')`` codes into a per-field
+vocabulary (seeded with the app's constants), pitches as a 10-bit mask over
+``PITCH_TYPES`` and names as an interned string list.  ``table[pos]`` gives a
+read-only :class:`RowView` that behaves like the old player dict, so the
+rendering and sorting code keeps working unchanged.
+"""
+import sys
+from array import array
+from collections.abc import Mapping
+
+from pitchdb.constants import IMPAC_TYPES, PITCH_TYPES, ROLES, TEAMS, TYPE_CFG
+
+KEYS = ("team", "role", "raw_prefix", "name", "pitches", "player_type", "year", "impac_type")
+CAT_FIELDS = {"team": TEAMS, "role": ROLES, "raw_prefix": (), "player_type": list(TYPE_CFG),
+              "year": (), "impac_type": IMPAC_TYPES}
+PITCH_BIT = {pt: 1 << i for i, pt in enumerate(PITCH_TYPES)}
+# mask -> pitches in PITCH_TYPES order, for every 10-bit mask
+PITCH_LISTS = [tuple(pt for pt, b in PITCH_BIT.items() if m & b) for m in range(1 << len(PITCH_TYPES))]
+
+
+def pitch_mask(pitches):
+    m = 0
+    for pt in pitches:
+        m |= PITCH_BIT.get(pt, 0)
+    return m
+
+
+class Categorical:
+    """Value <-> small-int code; code 0 is always None.
+
+    Codes are stored in ``array('H')`` columns, so a field holds at most
+    MAX_CODES distinct values (None included).
+    """
+    MAX_CODES = 1 << 16
+
+    def __init__(self, values=(), field=""):
+        self.field = field
+        self.values = [None]
+        self.codes = {None: 0}
+        for v in values:
+            self.code(v)
+
+    def code(self, v):
+        c = self.codes.get(v)
+        if c is None:
+            if len(self.values) >= self.MAX_CODES:
+                raise ValueError(f"too many distinct {self.field or 'categorical'} values "
+                                 f"(array('H') codes hold at most {self.MAX_CODES - 1})")
+            c = self.codes[v] = len(self.values)
+            self.values.append(v)
+        return c
+
+
+class PlayerTable:
+    def __init__(self):
+        self.cats = {f: Categorical(v, f) for f, v in CAT_FIELDS.items()}
+        self.cols = {f: array("H") for f in CAT_FIELDS}
+        self.pitches = array("H")
+        self.names = []
+        self.live = bytearray()
+        self.overflow = {}   # pos -> (unknown pitches, unknown keys); rare
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, pos):
+        return RowView(self, pos) if pos < len(self.live) and self.live[pos] else None
+
+    def encode(self, p, add=True):
+        """Comparable tuple of everything stored for ``p``.
+
+        With ``add=False`` values outside the vocabularies are not added;
+        the result is then None, since no stored row can hold them.
+        """
+        if add:
+            codes = tuple(self.cats[f].code(p.get(f)) for f in CAT_FIELDS)
+        else:
+            codes = tuple(self.cats[f].codes.get(p.get(f)) for f in CAT_FIELDS)
+            if None in codes:
+                return None
+        pitches = p.get("pitches", [])
+        extra_pitches = tuple(pt for pt in pitches if pt not in PITCH_BIT)
+        extra_keys = {k: v for k, v in p.items() if k not in KEYS}
+        return codes, p.get("name", ""), pitch_mask(pitches), extra_pitches, extra_keys
+
+    def _encoded(self, pos):
+        extra_pitches, extra_keys = self.overflow.get(pos, ((), {}))
+        return (tuple(self.cols[f][pos] for f in CAT_FIELDS), self.names[pos],
+                self.pitches[pos], extra_pitches, extra_keys)
+
+    def set(self, pos, p):
+        while len(self.names) <= pos:
+            for col in self.cols.values():
+                col.append(0)
+            self.pitches.append(0)
+            self.names.append("")
+            self.live.append(0)
+        codes, name, mask, extra_pitches, extra_keys = self.encode(p)
+        for f, c in zip(CAT_FIELDS, codes):
+            self.cols[f][pos] = c
+        self.names[pos] = sys.intern(name)
+        self.pitches[pos] = mask
+        if extra_pitches or extra_keys:
+            self.overflow[pos] = (extra_pitches, extra_keys)
+        else:
+            self.overflow.pop(pos, None)
+        self.live[pos] = 1
+
+    def clear(self, pos):
+        self.live[pos] = 0
+        self.names[pos] = ""
+        self.overflow.pop(pos, None)
+
+    def value(self, pos, key):
+        if key in CAT_FIELDS:
+            return self.cats[key].values[self.cols[key][pos]]
+        if key == "name":
+            return self.names[pos]
+        if key == "pitches":
+            extra = self.overflow.get(pos)
+            return list(PITCH_LISTS[self.pitches[pos]]) + list(extra[0] if extra else ())
+        extra = self.overflow.get(pos)
+        if extra and key in extra[1]:
+            return extra[1][key]
+        raise KeyError(key)
+
+    def keys(self, pos):
+        extra = self.overflow.get(pos)
+        return KEYS + tuple(extra[1]) if extra else KEYS
+
+    def to_dict(self, pos):
+        return {k: self.value(pos, k) for k in self.keys(pos)}
+
+
+def canonical(players):
+    """``players`` exactly as a PlayerTable hands them back (pitch order etc.),
+    so they compare equal to ``PlayerRepo.to_list()`` output."""
+    t = PlayerTable()
+    for pos, p in enumerate(players):
+        t.set(pos, p)
+    return [t.to_dict(pos) for pos in range(len(players))]
+
+
+class RowView(Mapping):
+    """Dict-like read-only view of one table row."""
+    __slots__ = ("table", "pos")
+
+    def __init__(self, table, pos):
+        self.table = table
+        self.pos = pos
+
+    def __getitem__(self, key):
+        return self.table.value(self.pos, key)
+
+    def __iter__(self):
+        return iter(self.table.keys(self.pos))
+
+    def __len__(self):
+        return len(self.table.keys(self.pos))
+
+    def __eq__(self, other):
+        if isinstance(other, RowView) and other.table is self.table:
+            return self.table._encoded(self.pos) == self.table._encoded(other.pos)
+        if isinstance(other, Mapping):
+            return self.table._encoded(self.pos) == self.table.encode(other, add=False)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RowView({self.table.to_dict(self.pos)!r})"
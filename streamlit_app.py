@@ -1,78 +1,45 @@
 import streamlit as st
-import json
-import re
-import base64
-import requests
+import io
+import os
+import time
+import functools
 from pathlib import Path
 
+from pitchdb.bulk import export_lines, import_rows, read_rows
+from pitchdb.constants import PITCH_TYPES, TEAMS, ROLES, IMPAC_TYPES, TYPE_CFG
+from pitchdb.gist import CircuitOpen, GistClient
+from pitchdb.index import mask_of
+from pitchdb.datasets import DEFAULT as DEFAULT_DATASET, VALID as VALID_DATASET, file_name, from_file_names, with_dataset
+from pitchdb.persist import WriteBehind
+from pitchdb.profiling import Profiler, RunTracker
+from pitchdb.migrations import classify
+from pitchdb.render import chunked, pitch_badge, section_html
+from pitchdb.similar import pitch_weights, similar, weight_table
+from pitchdb.sorting import TEAM_ORDER
+from pitchdb.stats import all_stats
+from pitchdb.storage import GistStorage, JournalStorage, JSONStorage, SQLiteStorage
+from pitchdb.store import Conflict, SharedStore
+from pitchdb.sync import GistSync
+from pitchdb.table import pitch_mask
+
 st.set_page_config(page_title="V26 구종 데이터베이스", page_icon="⚾", layout="wide")
 
-st.markdown("""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+KR:wght@300;400;500;700;900&family=Bebas+Neue&display=swap');
-:root {
-    --bg: #0d0f14; --surface: #161920; --surface2: #1e2230;
-    --accent: #e84545; --text: #e8eaf0; --muted: #5a6070; --border: #2a2f3d;
-}
-html, body, [data-testid="stAppViewContainer"] { background-color:var(--bg)!important; color:var(--text)!important; font-family:'Noto Sans KR',sans-serif; }
-[data-testid="stSidebar"] { background-color:var(--surface)!important; border-right:1px solid var(--border); }
-h1,h2,h3 { font-family:'Bebas Neue','Noto Sans KR',sans-serif; letter-spacing:2px; }
-.pitch-badge { display:inline-block; padding:2px 10px; border-radius:4px; font-size:12px; font-weight:700; margin:2px; }
-.player-card { background:var(--surface); border:1px solid var(--border); border-radius:8px; padding:16px; margin-bottom:12px; }
-.player-card:hover { border-color:var(--accent); }
-.player-name { font-size:18px; font-weight:700; color:var(--text); margin-bottom:4px; }
-.player-meta { font-size:12px; color:var(--muted); margin-bottom:8px; }
-.pitch-포심{background:#1e3a5f;color:#60a5fa} .pitch-투심{background:#1e3a2f;color:#4ade80}
-.pitch-체인지업{background:#3f1d2f;color:#f472b6} .pitch-서클체인지업{background:#4a1060;color:#d946ef}
-.pitch-슬라이더{background:#3f2c10;color:#fb923c} .pitch-커브{background:#2c1c10;color:#fbbf24}
-.pitch-커터{background:#1a2c20;color:#34d399} .pitch-싱커{background:#2a1520;color:#f87171}
-.pitch-포크{background:#1a1a2e;color:#818cf8} .pitch-스플리터{background:#2d1b3d;color:#c084fc}
-.section-title { font-family:'Bebas Neue',sans-serif; font-size:22px; letter-spacing:3px; color:var(--accent); border-left:4px solid var(--accent); padding-left:12px; margin:20px 0 12px 0; }
-.count-chip { background:var(--surface2); border:1px solid var(--border); border-radius:20px; padding:2px 12px; font-size:13px; color:var(--muted); display:inline-block; margin-left:8px; }
-.stTextInput>div>input,.stSelectbox>div,.stMultiSelect>div { background-color:var(--surface2)!important; border-color:var(--border)!important; color:var(--text)!important; }
-hr { border-color:var(--border); }
-
-
-
-/* Card type colored buttons - inject via JS-based class trick not available,
-   so we use streamlit's built-in primary/secondary and override colors inline */
-button[data-testid*="골글"], button[data-testid*="시그"], button[data-testid*="임팩"] {
-    font-weight: 700 !important;
-}
-.header-banner { background:linear-gradient(135deg,#0d0f14 0%,#1a1020 50%,#0d0f14 100%); border:1px solid var(--border); border-bottom:3px solid var(--accent); border-radius:8px; padding:24px 32px; margin-bottom:24px; text-align:center; }
-.header-banner h1 { font-size:48px; color:var(--text); margin:0; line-height:1; }
-.header-banner p { color:var(--muted); margin-top:8px; font-size:14px; letter-spacing:2px; }
-.flabel { font-size:12px; color:#5a6070; letter-spacing:1px; margin-bottom:4px; margin-top:8px; }
-
-/* Action buttons (추가/저장/삭제) - visible styled */
-.action-btn > div > button { background:var(--accent)!important; color:white!important; font-weight:700!important; border:none!important; border-radius:6px!important; }
-.action-btn > div > button:hover { background:#c73333!important; }
-.del-btn > div > button { background:#374151!important; color:#f87171!important; font-weight:700!important; border:1px solid #f87171!important; border-radius:6px!important; }
-
-/* Filter buttons: hide native Streamlit button text/style, show only our custom div above */
-.fbtn-wrap { position:relative; }
-.fbtn-wrap > div[data-testid="stButton"] > button {
-    position:absolute!important; top:0!important; left:0!important;
-    width:100%!important; height:100%!important;
-    opacity:0!important; cursor:pointer!important;
-    border:none!important; background:transparent!important;
-    z-index:10!important; margin:0!important; padding:0!important;
-}
-</style>
-""", unsafe_allow_html=True)
-
-# ── Constants ──────────────────────────────────────────────────────────────────
-DATA_FILE = Path("pitcher_data.json")
-PITCH_TYPES = ["포심","투심","체인지업","서클체인지업","슬라이더","커브","커터","싱커","포크","스플리터"]
-TEAMS = ["삼성","기아","KT","한화","LG","SSG","키움","롯데","NC","두산"]
-ROLES = ["선발","중계","마무리"]
-IMPAC_TYPES = ["우에","좌에","여사","가사","당쇠","구조대","베테랑","탑","구마",
-               "얼리","베포","분메","파볼","저니맨","키플","백노","난세","죄에",
-               "전천후","마무리","FA","올","중계","느미"]
-TYPE_CFG = {"골글":("#c9a227","black"), "시그":("#dc2626","white"), "임팩":("#16a34a","white"), "국대":("#2563eb","white"), "라이브":("#e8eaf0","black")}
+# The stylesheet is a static asset (server.enableStaticServing in
+# .streamlit/config.toml): the browser fetches and caches it once, and each
+# rerun only sends this one-line reference instead of the whole block.
+@st.cache_resource
+def _inline_css():
+    return (Path(__file__).parent / "static" / "style.css").read_text(encoding="utf-8")
+
+if st.get_option("server.enableStaticServing"):
+    st.markdown('<style>@import url("app/static/style.css");</style>', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>\n{_inline_css()}</style>", unsafe_allow_html=True)
 
 # ── Data ───────────────────────────────────────────────────────────────────────
+@st.cache_data
 def default_data():
+    """Built-in roster; parsed once per process, callers get their own copy."""
     raw = [
         {"team":"삼성","role":"선발","raw_prefix":"22","name":"수아레즈","pitches":["포심","투심","체인지업","슬라이더","커브"]},
         {"team":"삼성","role":"선발","raw_prefix":"14","name":"벤덴헐크","pitches":["포심","투심","체인지업","슬라이더","커브"]},
@@ -258,26 +225,8 @@ def default_data():
         {"team":"두산","role":"마무리","raw_prefix":"얼리","name":"김택연","pitches":["포심","슬라이더","커브","포크"]},
         {"team":"두산","role":"마무리","raw_prefix":"마무리","name":"프록터","pitches":["포심","투심","체인지업","슬라이더","포크"]},
     ]
-    IMPAC_KW = set(IMPAC_TYPES) | {"FA","골"}
-    for p in raw:
-        prefix = p["raw_prefix"]
-        nums = re.findall(r'\d+', prefix)
-        korean = re.findall(r'[가-힣]+', prefix)
-        latin = re.findall(r'[A-Za-z]+', prefix)
-        kw = (korean or latin or [""])[0]
-        if prefix == "골":
-            p["player_type"] = "골글"; p["year"] = None; p["impac_type"] = None
-        elif kw == "국대":
-            p["player_type"] = "국대"; p["year"] = None; p["impac_type"] = None
-        elif kw == "라이브":
-            p["player_type"] = "라이브"; p["year"] = None; p["impac_type"] = None
-        elif nums:
-            p["player_type"] = "시그"; p["year"] = nums[0]
-            p["impac_type"] = korean[0] if korean and korean[0] in IMPAC_KW else None
-        elif kw in IMPAC_KW or kw.upper() in ["FA"]:
-            p["player_type"] = "임팩"; p["impac_type"] = kw; p["year"] = None
-        else:
-            p["player_type"] = "시그"; p["year"] = None; p["impac_type"] = None
+    for p, parsed in zip(raw, classify([p["raw_prefix"] for p in raw])):
+        p["player_type"], p["year"], p["impac_type"] = parsed
     return raw
 
 def _gh_cfg():
@@ -288,142 +237,259 @@ def _gh_cfg():
     except Exception:
         return None, None
 
-def _migrate(data):
-    for p in data:
-        if p.get("team") == "골글":
-            p["team"] = "삼성"
-            p["player_type"] = "골글"
-        # Convert 국에 impac → 국대 card type
-        if p.get("impac_type") == "국에" or p.get("player_type") == "임팩" and p.get("impac_type") == "국에":
-            p["player_type"] = "국대"
-            p["impac_type"] = None
-        # Convert 라이브 impac → 라이브 card type
-        if p.get("impac_type") == "라이브":
-            p["player_type"] = "라이브"
-            p["impac_type"] = None
-    return data
-
-def save_data(data):
-    token, gist_id = _gh_cfg()
+def _gist_url(gist_id):
+    try:
+        base = st.secrets["github"].get("api_url", "https://api.github.com")
+    except Exception:
+        base = "https://api.github.com"
+    return f"{base}/gists/{gist_id}"
 
-    # ── Gist save ──
-    if token and gist_id:
-        url = f"https://api.github.com/gists/{gist_id}"
-        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
-        payload = json.dumps(data, ensure_ascii=False, indent=2)
-        r = requests.patch(url, headers=headers, json={"files": {"pitcher_data.json": {"content": payload}}})
-        if r.status_code == 200:
-            return  # success
-
-    # ── Local fallback ──
-    for path in [DATA_FILE, Path("/tmp/pitcher_data.json")]:
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            return
-        except Exception:
-            continue
+def _cfg(section, key, default):
+    try:
+        return type(default)(st.secrets[section][key])
+    except Exception:
+        return default
 
-def load_data():
-    token, gist_id = _gh_cfg()
+def _persist_cfg(key, default):
+    return _cfg("persist", key, default)
+
+def _local_paths(dataset):
+    return [Path(file_name(dataset)), Path("/tmp") / file_name(dataset)]
+
+def _local_storage(dataset):
+    return JSONStorage(_local_paths(dataset))
+
+def _load_local(dataset):
+    """Local files, then the built-in roster (the pre-backend fallback order); new datasets start empty."""
+    try:
+        players, _ = JSONStorage(_local_paths(dataset)[::-1]).load()
+        return players
+    except Exception:
+        return default_data() if dataset == DEFAULT_DATASET else []
 
-    # ── Gist load ──
+@st.cache_data(ttl=300)
+def _datasets():
+    """The default dataset, any listed in [persist] datasets, and any found in storage."""
+    names = [DEFAULT_DATASET]
+    try:
+        names += [str(d) for d in st.secrets["persist"]["datasets"]]
+    except Exception:
+        pass
+    try:
+        backend = _backend(DEFAULT_DATASET)
+        if isinstance(backend, GistStorage):
+            files = backend.file_names()
+        else:
+            files = [p.name for d in (Path("."), Path("/tmp")) for p in d.glob("pitcher_data.*")]
+        names += from_file_names(files)
+    except Exception:
+        pass
+    return list(dict.fromkeys(names))
+
+@st.cache_resource
+def _profiler():
+    """Section timings for the whole server process; each run opts in with prof.activate."""
+    return Profiler()
+
+@st.cache_resource
+def _gist_sync(gist_id):
+    """One pooled, timeout-bounded connection and one poller per Gist, shared by all its dataset files."""
+    token, _ = _gh_cfg()
+    gh = lambda key, default: _cfg("github", key, default)
+    client = GistClient(_gist_url(gist_id), token,
+                        timeout=(gh("connect_timeout", 3.05), gh("read_timeout", 10.0)),
+                        failures=gh("breaker_failures", 3), cooldown=gh("breaker_cooldown", 60.0))
+    return GistSync(client, interval=gh("refresh", 30.0), profiler=_profiler())
+
+@st.cache_resource
+def _backend(dataset):
+    """Primary storage for one dataset: Gist file if configured, else persist.backend."""
+    token, gist_id = _gh_cfg()
     if token and gist_id:
-        url = f"https://api.github.com/gists/{gist_id}"
-        headers = {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
-        r = requests.get(url, headers=headers)
-        if r.status_code == 200:
-            try:
-                raw = r.json()["files"]["pitcher_data.json"]["content"]
-                data = json.loads(raw)
-                if data:  # non-empty → migrate and return
-                    return _migrate(data)
-            except Exception:
-                pass
-
-    # ── Local fallback ──
-    for path in [Path("/tmp/pitcher_data.json"), DATA_FILE]:
-        if path.exists():
-            try:
-                with open(path) as f:
-                    return _migrate(json.load(f))
-            except Exception:
-                continue
-    return default_data()
-
-if "players" not in st.session_state:
-    st.session_state.players = load_data()
-
-# ── Badge helpers ──────────────────────────────────────────────────────────────
-def pitch_badge(pitch):
-    return f'<span class="pitch-badge pitch-{pitch}">{pitch}</span>'
-
-def player_card_html(p):
-    ordered = sorted(p.get("pitches", []), key=lambda x: PITCH_TYPES.index(x) if x in PITCH_TYPES else 99)
-    pitches_html = "".join(pitch_badge(pt) for pt in ordered)
-    ptype = p.get("player_type","")
-    bg, fg = TYPE_CFG.get(ptype, ("#374151","#d1d5db"))
-    type_b = f'<span class="pitch-badge" style="background:{bg};color:{fg};">{ptype}</span>'
-    extra = ""
-    if p.get("year"):
-        extra += f'<span class="pitch-badge" style="background:#1e3a5f;color:#60a5fa;">{p["year"]}</span>'
-    if p.get("impac_type"):
-        extra += f'<span class="pitch-badge" style="background:#16a34a;color:white;">{p["impac_type"]}</span>'
-    meta = f'팀: {p["team"]} · 역할: {p["role"]}'
-    return f"""<div class="player-card">
-        <div class="player-name">{p['name']}</div>
-        <div style="margin:6px 0">{type_b}{extra}</div>
-        <div class="player-meta" style="margin-bottom:8px">{meta}</div>
-        <div>{pitches_html}</div>
-    </div>"""
-
-# ── Filter button renderer (NO overlay div — pure Streamlit buttons with st.markdown label above) ──
-def fbtn_row(label, options, state_key, multi=False, col_count=None, colors=None):
+        return GistStorage(_gist_sync(gist_id), file=file_name(dataset), fmt=_cfg("github", "format", "dict"))
+    kind = _persist_cfg("backend", "journal")
+    if kind == "sqlite":
+        return SQLiteStorage(with_dataset(_persist_cfg("sqlite_path", "pitcher_data.db"), dataset))
+    if kind == "journal":
+        for path in _local_paths(dataset):
+            if os.access(path.parent, os.W_OK) and (not path.exists() or os.access(path, os.W_OK)):
+                return JournalStorage(path, compact_every=_persist_cfg("compact_every", 500),
+                                      seed=lambda: _load_local(dataset))
+    return _local_storage(dataset)
+
+@st.cache_resource
+def _persister(dataset):
+    """One write-behind queue per whole-list dataset per server process (all sessions share the backend)."""
+    backend = _backend(dataset)
+    local = _local_storage(dataset)
+    fallback = (lambda data: local.save(*data)) if isinstance(backend, GistStorage) else None
+    return WriteBehind(_profiler().timed("save.backend", lambda data: backend.save(*data)),
+                       delay=_persist_cfg("delay", 2.0), fallback=fallback, fail_fast=(CircuitOpen,))
+
+def save_data(dataset, players, ids):
+    """Queue a save; the Gist PATCH / file write happens off the script thread."""
+    _persister(dataset).mark_dirty((players, ids))
+
+def load_data(dataset):
+    """Return (players, ids) from the backend, else local files / built-in roster."""
+    backend = _backend(dataset)
+    try:
+        players, ids = backend.load()
+        if players:  # backends return current-schema players
+            return players, ids
+    except Exception:
+        pass
+    players = _load_local(dataset)
+    ids = list(range(len(players)))
+    if backend.incremental:
+        backend.save(players, ids)  # seed an empty record-level store
+    return players, ids
+
+@st.cache_resource
+def _store(dataset):
+    """Loaded the first time any session opens ``dataset``; every session reads the same store."""
+    backend = _backend(dataset)
+    with _profiler().section("load"):
+        players, ids = load_data(dataset)
+    store = SharedStore(players, ids, backend=backend,
+                        persist=None if backend.incremental else functools.partial(save_data, dataset),
+                        profiler=_profiler())
+    if isinstance(backend, GistStorage):
+        persister = _persister(dataset)
+        backend.on_rebase = store.rebased  # remote edits merged in by a save
+        def apply(data):
+            with store.lock:
+                state = persister.status()["state"]
+                if state in ("fallback", "failed"):
+                    # Gist is back but the last save only reached local files: save it (merged) first.
+                    store.persist(store.repo.to_list(), store.repo.ids())
+                    return False
+                if state in ("pending", "saving", "retrying"):
+                    return False  # local edits not uploaded yet; the save merges them
+                store.apply_remote(*backend.accept(data))
+            return True
+        backend.watch(apply)
+    return store
+
+# ── Profiling (opt-in) ─────────────────────────────────────────────────────────
+def _debug_cfg(key, default):
+    try:
+        return str(st.secrets["debug"][key])
+    except Exception:
+        return default
+
+def _profile_mode():
+    """"" (off), "time" or "cprofile" — from ?profile=… or [debug] profile in secrets."""
+    mode = (st.query_params.get("profile") or _debug_cfg("profile", "")).lower()
+    if mode in ("", "0", "false", "off"):
+        return ""
+    return "cprofile" if mode == "cprofile" else "time"
+
+prof = _profiler()
+_prof_mode = _profile_mode()
+prof.activate(bool(_prof_mode))   # this session's run only; other sessions are not timed
+if _prof_mode:
+    prof.enabled = True   # shared background work (saves, Gist polling) from now on
+    st.session_state.setdefault("_runs", RunTracker()).begin(cprofile=_prof_mode == "cprofile")
+
+def _end_run(rerun=False):
+    """Close the profiled run; pass rerun=True right before an st.rerun()."""
+    if _prof_mode:
+        st.session_state["_runs"].end(prof, rerun, dump_dir=_debug_cfg("profile_dir", None))
+
+def stop():
+    _end_run()
+    st.stop()
+
+def _fragment(fn):
+    """st.fragment whose fragment-only reruns (which skip the top of the
+    script) are still timed and counted as runs."""
+    @functools.wraps(fn)
+    def body(*args, **kwargs):
+        prof.activate(bool(_prof_mode))
+        if not _prof_mode:
+            return fn(*args, **kwargs)
+        with st.session_state["_runs"].fragment(prof, cprofile=_prof_mode == "cprofile",
+                                                dump_dir=_debug_cfg("profile_dir", None)):
+            return fn(*args, **kwargs)
+    return st.fragment(body)
+
+# ── Toggle buttons (state changes in on_click callbacks → one rerun per click) ──
+def _toggle(state_key, opt, multi, clearable=True, then=None):
+    if multi:
+        s = set(st.session_state[state_key])
+        if opt in s:
+            s.discard(opt)
+        else:
+            s.add(opt)
+        st.session_state[state_key] = s
+    elif st.session_state[state_key] != opt:
+        st.session_state[state_key] = opt
+    elif clearable:
+        st.session_state[state_key] = ""
+    if then:
+        then()
+
+def fbtn_row(label, options, state_key, multi=False, per_row=None, key=None, clearable=True):
+    """``per_row`` buttons a row (default 3–10), active = primary; a click toggles state_key."""
     st.markdown(f'<div class="flabel">{label}</div>', unsafe_allow_html=True)
-    n = col_count or len(options)
-    chunks = [options[i:i+n] for i in range(0, len(options), n)]
-    for chunk in chunks:
-        cols = st.columns(n)
-        for j in range(n):
-            if j >= len(chunk):
-                break
-            opt = chunk[j]
-            s = st.session_state[state_key]
-            active = (opt in s) if multi else (s == opt)
-            ac = (colors or {}).get(opt, ("#e84545","white"))
-            bg = ac[0] if active else "#1e2230"
-            fg = ac[1] if active else "#9aa0b0"
-            bdr = f"2px solid {ac[0]}" if active else "1px solid #2a2f3d"
+    kp = key or state_key
+    n = per_row or min(10, max(3, len(options)))
+    cur = st.session_state[state_key]
+    for chunk in [options[i:i+n] for i in range(0, len(options), n)]:
+        cols = st.columns(len(chunk))
+        for j, opt in enumerate(chunk):
+            active = (opt in cur) if multi else (cur == opt)
             with cols[j]:
-                # Single styled button — no overlay
-                clicked = st.button(
-                    opt,
-                    key=f"{state_key}__{opt}",
-                    use_container_width=True,
-                )
-                # Apply style via markdown targeting the button above
-                st.markdown(f"""<style>
-                div[data-testid="stButton"]:has(button[kind][data-testid]) {{}}
-                </style>""", unsafe_allow_html=True)
-                if clicked:
-                    if multi:
-                        cur = st.session_state[state_key]
-                        cur.discard(opt) if opt in cur else cur.add(opt)
-                        st.session_state[state_key] = cur
-                    else:
-                        st.session_state[state_key] = "" if s == opt else opt
-                    st.rerun()
-                # Show colored indicator below button
-                st.markdown(
-                    f'<div style="height:4px;border-radius:2px;background:{bg};margin-top:-8px;margin-bottom:4px;border:none;"></div>',
-                    unsafe_allow_html=True
-                )
+                st.button(opt, key=f"{kp}__{opt}", use_container_width=True, type="primary" if active else "secondary",
+                          on_click=_toggle, args=(state_key, opt, multi, clearable))
 
 # ── Sidebar ────────────────────────────────────────────────────────────────────
 with st.sidebar:
     st.markdown('<div style="font-family:\'Bebas Neue\',sans-serif;font-size:28px;letter-spacing:3px;color:#e84545;">⚾ V26 구종 DB</div>', unsafe_allow_html=True)
     st.markdown("---")
-    page = st.radio("메뉴", ["🔍 검색", "➕ 선수 추가", "✏️ 선수 편집"])
+    def _dataset_changed():
+        for k in ("_etarget", "_e_conflict", "s_page"):  # ids belong to the old dataset
+            st.session_state.pop(k, None)
+    def _new_dataset():
+        name = st.session_state["new_dataset"].strip()
+        if VALID_DATASET.fullmatch(name):
+            st.session_state.setdefault("_new_datasets", []).append(name)
+            st.session_state["dataset"] = name
+            st.session_state["new_dataset"] = ""
+            _dataset_changed()
+    _ds_opts = list(dict.fromkeys(_datasets() + st.session_state.get("_new_datasets", [])))
+    dataset = st.selectbox("데이터셋", _ds_opts, key="dataset", on_change=_dataset_changed)
+    with st.expander("➕ 새 데이터셋"):
+        st.text_input("이름 (예: V25)", key="new_dataset", help="영문·숫자·한글·_·- 최대 32자")
+        st.button("만들기", key="new_dataset_btn", on_click=_new_dataset, use_container_width=True)
+    page = st.radio("메뉴", ["🔍 검색", "🎯 유사 투수", "📊 통계", "➕ 선수 추가", "✏️ 선수 편집"])
+    st.markdown("---")
+    _backend_now = _backend(dataset)
+    # Record-level backends are written through by the store; only whole-list ones have a write-behind queue.
+    _ps = _store(dataset).status() if _backend_now.incremental else _persister(dataset).status()
+    _ps_label = {"idle":"✅ 저장됨","pending":"⏳ 저장 대기","saving":"💾 저장 중","retrying":"🔁 재시도 중","fallback":"💽 로컬 파일에 저장됨","failed":"⚠️ 저장 실패"}[_ps["state"]]
+    if _ps["last_ok"]:
+        _ps_label += f' · 마지막 저장 {time.strftime("%H:%M:%S", time.localtime(_ps["last_ok"]))}'
+    st.caption(_ps_label)
+    if _ps["last_error"]:
+        st.caption(f'오류: {_ps["last_error"]}')
+    if _ps["fallbacks"]:
+        st.caption(f'로컬 대체 저장 {_ps["fallbacks"]}회 · 마지막 {time.strftime("%H:%M:%S", time.localtime(_ps["last_fallback"]))}')
+    if isinstance(_backend_now, GistStorage):
+        _cs = _backend_now.sync.client.status()
+        if _cs["state"] != "closed":
+            st.caption(f'🔌 Gist 연결 차단 · {_cs["retry_in"] or 0:.0f}초 후 재시도 ({_cs["last_error"]})')
+    if _prof_mode:
+        with st.expander("⏱️ 프로파일 (ms)", expanded=True):
+            _runs = st.session_state["_runs"]
+            _rr = list(_runs.reruns)
+            st.caption(f"실행 {_runs.runs}회" + (f" · 조작당 평균 {sum(_rr)/len(_rr):.1f}회 (최대 {max(_rr)})" if _rr else ""))
+            st.dataframe(prof.table(), hide_index=True, use_container_width=True)
+            if _runs.last_profile:
+                st.code(_runs.last_profile, language=None)
+
+store = _store(dataset)
 
 st.markdown("""<div class="header-banner"><h1>컴투스 프로야구 V26</h1><p>⚾ 투수 구종 데이터베이스 ⚾</p></div>""", unsafe_allow_html=True)
 
@@ -432,21 +498,17 @@ st.markdown("""<div class="header-banner"><h1>컴투스 프로야구 V26</h1><p>
 def card_type_row(label, state_key, key_prefix, impac_reset_key=None):
     """Card type: button + colored underline bar. Works for search (set) and add/edit (str)."""
     st.markdown(f'<div class="flabel">{label}</div>', unsafe_allow_html=True)
+    multi = isinstance(st.session_state[state_key], set)
+    def reset_impac():
+        if impac_reset_key and "임팩" not in st.session_state[state_key]:
+            st.session_state[impac_reset_key] = set()
     cols = st.columns(len(TYPE_CFG))
     for i, (opt, (ac, tc)) in enumerate(TYPE_CFG.items()):
-        is_active = (opt in st.session_state[state_key]) if isinstance(st.session_state[state_key], set) else (st.session_state[state_key] == opt)
+        is_active = (opt in st.session_state[state_key]) if multi else (st.session_state[state_key] == opt)
         with cols[i]:
-            if st.button(opt, key=f"{key_prefix}_type__{opt}", use_container_width=True,
-                         type="primary" if is_active else "secondary"):
-                if isinstance(st.session_state[state_key], set):
-                    s = st.session_state[state_key]
-                    s.discard(opt) if opt in s else s.add(opt)
-                    st.session_state[state_key] = s
-                    if impac_reset_key and opt == "임팩" and "임팩" not in st.session_state[state_key]:
-                        st.session_state[impac_reset_key] = set()
-                else:
-                    st.session_state[state_key] = "" if is_active else opt
-                st.rerun()
+            st.button(opt, key=f"{key_prefix}_type__{opt}", use_container_width=True,
+                      type="primary" if is_active else "secondary",
+                      on_click=_toggle, args=(state_key, opt, multi, True, reset_impac))
             bar_color = ac if is_active else "transparent"
             st.markdown(f'<div style="height:3px;background:{bar_color};border-radius:2px;margin-top:-8px;margin-bottom:4px;"></div>', unsafe_allow_html=True)
 
@@ -455,176 +517,250 @@ if "🔍 검색" in page:
         if k not in st.session_state: st.session_state[k] = d
     if "s_sort" not in st.session_state: st.session_state["s_sort"] = "팀순"
 
-    def s_toggle(key, val):
-        s = st.session_state[key]
-        s.discard(val) if val in s else s.add(val)
-        st.session_state[key] = s
-
-    def flex_btn_row(label, options, state_key, multi=True, key_prefix=None):
-        """Render buttons 3–10 per row, active = primary (red), inactive = secondary."""
-        st.markdown(f'<div class="flabel">{label}</div>', unsafe_allow_html=True)
-        kp = key_prefix or state_key
-        n = min(10, max(3, len(options)))
-        chunks = [options[i:i+n] for i in range(0, len(options), n)]
-        for chunk in chunks:
-            cols = st.columns(len(chunk))
-            for j, opt in enumerate(chunk):
-                s = st.session_state[state_key]
-                active = (opt in s) if multi else (s == opt)
-                with cols[j]:
-                    if st.button(opt, key=f"{kp}__{opt}", use_container_width=True,
-                                 type="primary" if active else "secondary"):
-                        if multi: s_toggle(state_key, opt)
-                        else: st.session_state[state_key] = "" if active else opt
-                        st.rerun()
-
-    search_name = st.text_input("🔎 선수명 검색", placeholder="이름 입력...")
-    st.markdown("---")
-
-    flex_btn_row("팀", TEAMS, "s_team")
-    st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
+    def filter_mask(repo, f):
+        """Result mask for the filter set; with SQLite the team/role/type/pitch/year filters run in SQL.
+
+        The name filter stays on the in-memory index, which also matches 초성.
+        """
+        backend = store.backend
+        # After a failed write the database lags the store until the next save succeeds.
+        if not isinstance(backend, SQLiteStorage) or store.status()["state"] != "idle":
+            return repo.index.query(**f)
+        mask = mask_of(backend.query(**{k: v for k, v in f.items() if k != "name"}))
+        return mask & repo.index.names.mask(f["name"]) if f["name"] and mask else mask
+
+    @_fragment
+    def search_results():
+        """Result list + paging; page, page-size and export changes rerun only this part."""
+        # Filter
+        f = st.session_state["s_filter"]
+        repo = store.repo
+        with store.lock, prof.section("filter"):
+            mask = filter_mask(repo, f)
+
+        # Sort + paging
+        sort_key = st.session_state["s_sort"]
+        total = mask.bit_count()
+        pc1, pc2 = st.columns([1,1])
+        with pc1:
+            page_size = st.selectbox("페이지당 카드 수", [20, 50, 100, 200], index=1, key="s_page_size")
+        with pc2:
+            collapse = sort_key == "팀순" and st.checkbox("팀 섹션 접기 (인원수만 표시)", key="s_collapse")
+        n_pages = max(1, -(-total // page_size))
+
+        # Any filter/sort change starts over from page 1
+        sig = (tuple(f.items()), sort_key, page_size)
+        if st.session_state.get("_s_sig") != sig:
+            st.session_state["_s_sig"] = sig
+            st.session_state["s_page"] = 0
+        cur_page = min(st.session_state.get("s_page", 0), n_pages - 1)
+
+        st.markdown(f'<div style="color:#5a6070;margin-bottom:16px;">검색 결과 <span style="color:#e8eaf0;font-weight:700;">{total}</span>명</div>', unsafe_allow_html=True)
+
+        if total and st.checkbox("⬇️ 검색 결과 내보내기", key="s_export"):
+            with store.lock:
+                with prof.section("sort"):
+                    rows = [dict(repo.get(pid)) for pid in repo.sorted_ids(sort_key, mask & repo.index.all)]
+            ec1, ec2 = st.columns(2)
+            with ec1:
+                st.download_button("CSV 다운로드", "".join(export_lines(rows, "csv")).encode("utf-8-sig"),
+                                   file_name="pitchers.csv", mime="text/csv", use_container_width=True)
+            with ec2:
+                st.download_button("JSONL 다운로드", "".join(export_lines(rows, "jsonl")).encode("utf-8"),
+                                   file_name="pitchers.jsonl", mime="application/jsonl", use_container_width=True)
+
+        if total and collapse:
+            with store.lock:
+                team_counts = repo.index.counts("team", mask)
+            teams = sorted(team_counts, key=lambda t: TEAM_ORDER.get(t, 99))
+            st.markdown("".join(section_html(t, team_counts[t]) for t in teams), unsafe_allow_html=True)
+        elif total:
+            parts = []
+            with store.lock:
+                mask &= repo.index.all  # drop players another session deleted meanwhile
+                with prof.section("sort"):
+                    page_ids = repo.sorted_ids(sort_key, mask, cur_page * page_size, (cur_page + 1) * page_size)
+                with prof.section("render"):
+                    if sort_key == "팀순":
+                        team_counts = repo.index.counts("team", mask)
+                        by_team = {}
+                        for pid in page_ids:
+                            by_team.setdefault(repo.get(pid)["team"], []).append(pid)
+                        for team, tp in by_team.items():
+                            parts.append(section_html(team, team_counts[team]))
+                            parts.extend(store.card(pid) for pid in tp)
+                    else:
+                        parts = [store.card(pid) for pid in page_ids]
+            # One markdown element per chunk instead of one per card
+            with prof.section("render.markdown"):
+                for html in chunked(parts):
+                    st.markdown(html, unsafe_allow_html=True)
+
+            if n_pages > 1:
+                nc1, nc2, nc3 = st.columns([1,2,1])
+                def s_goto(p):
+                    st.session_state["s_page"] = p
+                with nc1:
+                    st.button("◀ 이전", key="s_prev", use_container_width=True, disabled=cur_page == 0,
+                              on_click=s_goto, args=(cur_page - 1,))
+                with nc2:
+                    st.markdown(f'<div style="text-align:center;color:#5a6070;padding-top:8px;">{cur_page + 1} / {n_pages}</div>', unsafe_allow_html=True)
+                with nc3:
+                    st.button("다음 ▶", key="s_next", use_container_width=True, disabled=cur_page >= n_pages - 1,
+                              on_click=s_goto, args=(cur_page + 1,))
+        else:
+            st.info("검색 결과가 없습니다.")
+
+    @_fragment
+    def search_page():
+        """Filters + results; a filter click reruns this instead of CSS, sidebar and banner."""
+        search_name = st.text_input("🔎 선수명 검색", placeholder="이름 또는 초성 입력... (예: ㄹㄷㅂㄹ)", key="s_name")
+        if search_name:
+            with store.lock:
+                suggestions = [n for n, _ in store.repo.index.names.suggest(search_name, k=6) if n != search_name]
+            if suggestions:
+                def s_pick(name):
+                    st.session_state["s_name"] = name
+                sgcols = st.columns(len(suggestions))
+                for i, n in enumerate(suggestions):
+                    with sgcols[i]:
+                        st.button(n, key=f"s_suggest__{n}", use_container_width=True, on_click=s_pick, args=(n,))
+        st.markdown("---")
 
-    flex_btn_row("역할", ROLES, "s_role")
-    st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
+        fbtn_row("팀", TEAMS, "s_team", multi=True)
+        st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
 
-    card_type_row("카드 종류", "s_type", "s", impac_reset_key="s_impac")
-    st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
+        fbtn_row("역할", ROLES, "s_role", multi=True)
+        st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
 
-    # Only show impac filter if 임팩 is selected (or nothing selected)
-    show_impac = not st.session_state["s_type"] or "임팩" in st.session_state["s_type"]
-    if show_impac:
-        flex_btn_row("임팩 종류", IMPAC_TYPES, "s_impac")
+        card_type_row("카드 종류", "s_type", "s", impac_reset_key="s_impac")
         st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
-    elif st.session_state["s_impac"]:
-        st.session_state["s_impac"] = set()
-
-    col5, col6 = st.columns([2,1])
-    with col5:
-        filter_pitches = st.multiselect("구종 포함", PITCH_TYPES)
-    with col6:
-        filter_year = st.text_input("연도", placeholder="예: 22")
-
-    # Sort order
-    st.markdown('<div class="flabel">정렬 순서</div>', unsafe_allow_html=True)
-    sort_opts = ["팀순", "이름순", "카드종류순", "역할순"]
-    scols = st.columns(len(sort_opts))
-    for i, opt in enumerate(sort_opts):
-        active = st.session_state["s_sort"] == opt
-        with scols[i]:
-            if st.button(opt, key=f"s_sort__{opt}", use_container_width=True,
-                         type="primary" if active else "secondary"):
-                st.session_state["s_sort"] = opt; st.rerun()
 
-    st.markdown("---")
+        # Only show impac filter if 임팩 is selected (or nothing selected)
+        show_impac = not st.session_state["s_type"] or "임팩" in st.session_state["s_type"]
+        if show_impac:
+            fbtn_row("임팩 종류", IMPAC_TYPES, "s_impac", multi=True)
+            st.markdown("<div style='margin-bottom:4px'></div>", unsafe_allow_html=True)
+        elif st.session_state["s_impac"]:
+            st.session_state["s_impac"] = set()
 
-    # Filter
-    players = st.session_state.players
-    filtered = list(players)
-    if search_name:
-        filtered = [p for p in filtered if search_name in p["name"]]
-    if st.session_state["s_team"]:
-        filtered = [p for p in filtered if p["team"] in st.session_state["s_team"]]
-    if st.session_state["s_role"]:
-        filtered = [p for p in filtered if p["role"] in st.session_state["s_role"]]
-    if st.session_state["s_type"]:
-        filtered = [p for p in filtered if p.get("player_type") in st.session_state["s_type"]]
-    if st.session_state["s_impac"]:
-        filtered = [p for p in filtered if p.get("impac_type") in st.session_state["s_impac"]]
-    if filter_pitches:
-        filtered = [p for p in filtered if all(pt in p.get("pitches",[]) for pt in filter_pitches)]
-    if filter_year.strip():
-        filtered = [p for p in filtered if str(p.get("year") or "") == filter_year.strip()]
-
-    # Sort
-    TEAM_ORDER = {t:i for i,t in enumerate(TEAMS)}
-    ROLE_ORDER = {"선발":0,"중계":1,"마무리":2}
-    TYPE_ORDER = {"골글":0,"시그":1,"임팩":2}
-    sort_key = st.session_state["s_sort"]
-    if sort_key == "팀순":
-        filtered.sort(key=lambda p: (TEAM_ORDER.get(p["team"],99), ROLE_ORDER.get(p["role"],99)))
-    elif sort_key == "이름순":
-        filtered.sort(key=lambda p: p["name"])
-    elif sort_key == "카드종류순":
-        filtered.sort(key=lambda p: (TYPE_ORDER.get(p.get("player_type",""),99), TEAM_ORDER.get(p["team"],99)))
-    elif sort_key == "역할순":
-        filtered.sort(key=lambda p: (ROLE_ORDER.get(p["role"],99), TEAM_ORDER.get(p["team"],99)))
-
-    st.markdown(f'<div style="color:#5a6070;margin-bottom:16px;">검색 결과 <span style="color:#e8eaf0;font-weight:700;">{len(filtered)}</span>명</div>', unsafe_allow_html=True)
-
-    if filtered:
-        if sort_key == "팀순":
-            for team in list(dict.fromkeys(p["team"] for p in filtered)):
-                tp = [p for p in filtered if p["team"] == team]
-                st.markdown(f'<div class="section-title">{team} <span class="count-chip">{len(tp)}</span></div>', unsafe_allow_html=True)
-                for p in tp:
-                    st.markdown(player_card_html(p), unsafe_allow_html=True)
-        else:
-            for p in filtered:
-                st.markdown(player_card_html(p), unsafe_allow_html=True)
+        col5, col6 = st.columns([2,1])
+        with col5:
+            filter_pitches = st.multiselect("구종 포함", PITCH_TYPES, key="s_pitches")
+        with col6:
+            filter_year = st.text_input("연도", placeholder="예: 22", key="s_year")
+
+        # Sort order
+        fbtn_row("정렬 순서", ["팀순", "이름순", "카드종류순", "역할순"], "s_sort", clearable=False)
+
+        st.markdown("---")
+
+        st.session_state["s_filter"] = {
+            "name": search_name,
+            "team": frozenset(st.session_state["s_team"]),
+            "role": frozenset(st.session_state["s_role"]),
+            "player_type": frozenset(st.session_state["s_type"]),
+            "impac_type": frozenset(st.session_state["s_impac"]),
+            "pitches": tuple(filter_pitches),
+            "year": filter_year.strip(),
+        }
+        search_results()
+
+    search_page()
+
+elif "🎯 유사 투수" in page:
+    st.markdown('<div class="section-title">비슷한 구종 조합 찾기</div>', unsafe_allow_html=True)
+    repo = store.repo
+
+    q_mode = st.radio("기준", ["선수", "구종 직접 선택"], horizontal=True, key="sim_mode")
+    exclude = None
+    if q_mode == "선수":
+        c1, c2 = st.columns([1,2])
+        with c1: q_name = st.text_input("선수명 검색", key="sim_name")
+        with store.lock:
+            base = {pid: dict(repo.get(pid)) for pid in repo.ids(repo.index.query(name=q_name))}
+        if not base:
+            st.info("선수를 검색하세요.")
+            stop()
+        with c2:
+            exclude = st.selectbox("기준 선수", list(base), key="sim_pid",
+                                   format_func=lambda pid: f"{base[pid]['name']} ({base[pid]['team']}, {base[pid]['role']}, {base[pid].get('player_type','')})")
+        q_pitches = base[exclude].get("pitches", [])
+        st.markdown("".join(pitch_badge(pt) for pt in q_pitches), unsafe_allow_html=True)
+    else:
+        q_pitches = st.multiselect("구종", PITCH_TYPES, key="sim_pitches")
+        if not q_pitches:
+            st.info("구종을 하나 이상 선택하세요.")
+            stop()
+
+    c1, c2, c3 = st.columns(3)
+    with c1: sim_team = st.multiselect("팀 제한", TEAMS, key="sim_team")
+    with c2: sim_role = st.multiselect("역할 제한", ROLES, key="sim_role")
+    with c3: sim_type = st.multiselect("카드 종류 제한", list(TYPE_CFG), key="sim_type")
+    c1, c2 = st.columns([2,1])
+    with c1: metric = st.radio("유사도", ["자카드", "가중 겹침 (희귀 구종 가중)"], horizontal=True, key="sim_metric")
+    with c2: top_k = st.number_input("상위 N명", 1, 100, 10, key="sim_k")
+
+    with store.lock:
+        cand = repo.index.query(team=sim_team, role=sim_role, player_type=sim_type)
+        weights = weight_table(pitch_weights(repo.index)) if metric != "자카드" else None
+        hits = similar(repo.index.table, cand, pitch_mask(q_pitches), int(top_k), weights=weights, exclude=exclude)
+        parts = [f'<div class="flabel">유사도 {score:.2f}</div>' + store.card(pid) for score, pid in hits]
+    if parts:
+        for html in chunked(parts):
+            st.markdown(html, unsafe_allow_html=True)
     else:
         st.info("검색 결과가 없습니다.")
 
+elif "📊 통계" in page:
+    import pandas as pd
+
+    st.markdown('<div class="section-title">구종 통계</div>', unsafe_allow_html=True)
+    stats = store.cached("stats", all_stats)  # recomputed only after an edit
+    st.markdown(f'<div style="color:#5a6070;margin-bottom:16px;">전체 <span style="color:#e8eaf0;font-weight:700;">{stats["total"]}</span>명</div>', unsafe_allow_html=True)
+    as_pct = st.checkbox("비율(%)로 보기", key="st_pct")
+
+    def pct_rows(matrix, sizes):
+        return [[round(100 * c / n, 1) if n else 0.0 for c in row] for row, n in zip(matrix, sizes)]
+
+    tabs = st.tabs(["팀별", "역할별", "카드 종류별", "구종 동시 사용", "임팩 종류"])
+    for tab, field in zip(tabs[:3], ["team", "role", "player_type"]):
+        with tab:
+            rows, sizes, matrix = stats["by"][field]
+            df = pd.DataFrame(pct_rows(matrix, sizes) if as_pct else matrix, index=rows, columns=PITCH_TYPES)
+            df.insert(0, "인원", sizes)
+            st.dataframe(df, use_container_width=True)
+    with tabs[3]:
+        co = stats["cooccurrence"]
+        if as_pct:
+            st.caption("행 구종을 던지는 투수 중 열 구종도 던지는 비율")
+            co = pct_rows(co, [co[i][i] for i in range(len(co))])
+        st.dataframe(pd.DataFrame(co, index=PITCH_TYPES, columns=PITCH_TYPES), use_container_width=True)
+    with tabs[4]:
+        impac = pd.Series(stats["impac"], name="인원")
+        st.bar_chart(impac)
+        st.dataframe(impac.to_frame(), use_container_width=True)
+
 elif "➕ 선수 추가" in page:
     st.markdown('<div class="section-title">신규 선수 추가</div>', unsafe_allow_html=True)
 
     for k,d in [("a_team",""),("a_role",""),("a_type",""),("a_impac",""),("a_pitches",set())]:
         if k not in st.session_state: st.session_state[k] = d
 
-    def a_toggle_single(key, val):
-        st.session_state[key] = "" if st.session_state[key] == val else val
-    def a_toggle_multi(key, val):
-        s = st.session_state[key]
-        s.discard(val) if val in s else s.add(val)
-        st.session_state[key] = s
-
     add_name = st.text_input("선수명 *", placeholder="예: 류현진", key="a_name_input")
 
-    # Team
-    st.markdown('<div class="flabel">팀 *</div>', unsafe_allow_html=True)
-    atcols = st.columns(len(TEAMS))
-    for i, team in enumerate(TEAMS):
-        active = st.session_state["a_team"] == team
-        with atcols[i]:
-            if st.button(team, key=f"a_team__{team}", use_container_width=True, type="primary" if active else "secondary"):
-                a_toggle_single("a_team", team); st.rerun()
-
-    # Role
-    st.markdown('<div class="flabel">역할 *</div>', unsafe_allow_html=True)
-    arcols = st.columns(len(ROLES))
-    for i, role in enumerate(ROLES):
-        active = st.session_state["a_role"] == role
-        with arcols[i]:
-            if st.button(role, key=f"a_role__{role}", use_container_width=True, type="primary" if active else "secondary"):
-                a_toggle_single("a_role", role); st.rerun()
+    fbtn_row("팀 *", TEAMS, "a_team")
+    fbtn_row("역할 *", ROLES, "a_role")
 
     card_type_row("카드 종류 *", "a_type", "a")
 
     add_year = st.text_input("연도 (골글·시그)", placeholder="예: 22, 96, 08", key="a_year_input")
 
-    # Impac
-    st.markdown('<div class="flabel">임팩 종류 (임팩 카드)</div>', unsafe_allow_html=True)
-    imp_chunks = [IMPAC_TYPES[i:i+8] for i in range(0, len(IMPAC_TYPES), 8)]
-    for chunk in imp_chunks:
-        aicols = st.columns(8)
-        for j, opt in enumerate(chunk):
-            active = st.session_state["a_impac"] == opt
-            with aicols[j]:
-                if st.button(opt, key=f"a_impac__{opt}", use_container_width=True, type="primary" if active else "secondary"):
-                    a_toggle_single("a_impac", opt); st.rerun()
-
-    # Pitches
-    st.markdown('<div class="flabel">구종 *</div>', unsafe_allow_html=True)
-    pitch_chunks = [PITCH_TYPES[i:i+5] for i in range(0, len(PITCH_TYPES), 5)]
-    for chunk in pitch_chunks:
-        apcols = st.columns(5)
-        for j, opt in enumerate(chunk):
-            active = opt in st.session_state["a_pitches"]
-            with apcols[j]:
-                if st.button(opt, key=f"a_pitch__{opt}", use_container_width=True, type="primary" if active else "secondary"):
-                    a_toggle_multi("a_pitches", opt); st.rerun()
+    fbtn_row("임팩 종류 (임팩 카드)", IMPAC_TYPES, "a_impac", per_row=8)
+    fbtn_row("구종 *", PITCH_TYPES, "a_pitches", multi=True, per_row=5, key="a_pitch")
 
-    st.markdown("---")
-    if st.button("✅ 선수 추가", use_container_width=True, type="primary", key="a_submit"):
+    def a_submit():
+        add_name = st.session_state["a_name_input"]
         err = []
         if not add_name.strip(): err.append("선수명")
         if not st.session_state["a_team"]: err.append("팀")
@@ -632,142 +768,193 @@ elif "➕ 선수 추가" in page:
         if not st.session_state["a_type"]: err.append("카드 종류")
         if not st.session_state["a_pitches"]: err.append("구종")
         if err:
-            st.error(f"필수 항목을 선택하세요: {', '.join(err)}")
-        else:
-            ptype = st.session_state["a_type"]
-            year_val = None
-            yr_s = add_year.strip()
-            if yr_s:
-                try: year_val = yr_s  # keep as string to preserve leading zeros like "00","01"
-                except: pass
-            impac_val = st.session_state["a_impac"] if ptype == "임팩" and st.session_state["a_impac"] else None
-            st.session_state.players.append({
-                "team": st.session_state["a_team"],
-                "role": st.session_state["a_role"],
-                "raw_prefix": yr_s if ptype in ("골글","시그") else (impac_val or ""),
-                "name": add_name.strip(),
-                "pitches": list(st.session_state["a_pitches"]),
-                "player_type": ptype,
-                "year": year_val,
-                "impac_type": impac_val,
-            })
-            save_data(st.session_state.players)
-            for k,d in [("a_team",""),("a_role",""),("a_type",""),("a_impac",""),("a_pitches",set())]:
-                st.session_state[k] = d
-            st.success(f"✅ {add_name.strip()} 추가 완료!")
-            st.rerun()
-
-elif "✏️ 선수 편집" in page:
-    st.markdown('<div class="section-title">선수 편집 / 삭제</div>', unsafe_allow_html=True)
-    players = st.session_state.players
-
-    c1,c2 = st.columns(2)
-    with c1: search = st.text_input("선수명 검색")
-    with c2: team_f = st.selectbox("팀 필터", ["전체"]+TEAMS)
+            st.session_state["_a_msg"] = ("error", f"필수 항목을 선택하세요: {', '.join(err)}")
+            return
+        ptype = st.session_state["a_type"]
+        year_val = None
+        yr_s = st.session_state["a_year_input"].strip()
+        if yr_s:
+            try: year_val = yr_s  # keep as string to preserve leading zeros like "00","01"
+            except: pass
+        impac_val = st.session_state["a_impac"] if ptype == "임팩" and st.session_state["a_impac"] else None
+        store.insert({
+            "team": st.session_state["a_team"],
+            "role": st.session_state["a_role"],
+            "raw_prefix": yr_s if ptype in ("골글","시그") else (impac_val or ""),
+            "name": add_name.strip(),
+            "pitches": list(st.session_state["a_pitches"]),
+            "player_type": ptype,
+            "year": year_val,
+            "impac_type": impac_val,
+        })
+        for k,d in [("a_team",""),("a_role",""),("a_type",""),("a_impac",""),("a_pitches",set())]:
+            st.session_state[k] = d
+        st.session_state["_a_msg"] = ("success", f"✅ {add_name.strip()} 추가 완료!")
 
-    filtered = players
-    if search: filtered = [p for p in filtered if search in p["name"]]
-    if team_f != "전체": filtered = [p for p in filtered if p["team"] == team_f]
+    st.markdown("---")
+    st.button("✅ 선수 추가", use_container_width=True, type="primary", key="a_submit", on_click=a_submit)
+    if "_a_msg" in st.session_state:
+        kind, msg = st.session_state.pop("_a_msg")
+        getattr(st, kind)(msg)
 
-    if not filtered:
-        st.info("선수를 검색하세요.")
-    else:
-        opts_labels = [f"{p['name']} ({p['team']}, {p['role']}, {p.get('player_type','')} {p.get('year','') or p.get('impac_type','') or ''})" for p in filtered]
-        sel_label = st.selectbox("편집할 선수 선택", opts_labels)
-        sel = filtered[opts_labels.index(sel_label)]
-        gidx = players.index(sel)
-
-        if st.session_state.get("_etarget") != gidx:
-            st.session_state["_etarget"] = gidx
-            st.session_state["e_team"] = sel.get("team","")
-            st.session_state["e_role"] = sel.get("role","")
-            st.session_state["e_type"] = sel.get("player_type","")
-            st.session_state["e_impac"] = sel.get("impac_type","") or ""
-            st.session_state["e_pitches"] = set(sel.get("pitches",[]))
-
-        def e_single(key, val):
-            st.session_state[key] = "" if st.session_state[key] == val else val
-        def e_multi(key, val):
-            s = st.session_state[key]
-            s.discard(val) if val in s else s.add(val)
-            st.session_state[key] = s
+    st.markdown("---")
+    with st.expander("📥 일괄 가져오기 (CSV / JSONL / JSON)"):
+        st.caption("열: team, role, name, pitches(‘/’로 구분) + raw_prefix 또는 player_type/year/impac_type · JSON은 pitcher_data.json 형식")
+        up = st.file_uploader("파일 선택", type=["csv", "jsonl", "json"], key="a_bulk_file")
+        if up is not None:
+            fmt = {"csv": "csv", "json": "json"}.get(up.name.lower().rsplit(".", 1)[-1], "jsonl")
+            with store.lock:
+                existing = [store.repo.get(pid) for pid in store.repo.ids()]
+                new_players, row_errors, dupes = import_rows(read_rows(io.BytesIO(up.getvalue()), fmt), existing)
+            st.markdown(f"추가 가능 **{len(new_players)}**명 · 중복 {dupes}건 · 오류 {len(row_errors)}건")
+            if row_errors:
+                st.dataframe([{"줄": n, "오류": msg} for n, msg in row_errors], use_container_width=True)
+            if new_players and st.button(f"✅ {len(new_players)}명 일괄 추가", type="primary", key="a_bulk_submit"):
+                store.insert_many(new_players)  # one version bump, one save
+                st.success(f"✅ {len(new_players)}명 추가 완료!")
 
-        st.markdown("---")
-        e_name = st.text_input("선수명", value=sel["name"], key=f"e_name_{gidx}")
-
-        # Team
-        st.markdown('<div class="flabel">팀</div>', unsafe_allow_html=True)
-        etcols = st.columns(len(TEAMS))
-        for i, team in enumerate(TEAMS):
-            active = st.session_state["e_team"] == team
-            with etcols[i]:
-                if st.button(team, key=f"e_team__{team}__{gidx}", use_container_width=True, type="primary" if active else "secondary"):
-                    e_single("e_team", team); st.rerun()
-
-        # Role
-        st.markdown('<div class="flabel">역할</div>', unsafe_allow_html=True)
-        ercols = st.columns(len(ROLES))
-        for i, role in enumerate(ROLES):
-            active = st.session_state["e_role"] == role
-            with ercols[i]:
-                if st.button(role, key=f"e_role__{role}__{gidx}", use_container_width=True, type="primary" if active else "secondary"):
-                    e_single("e_role", role); st.rerun()
-
-        card_type_row("카드 종류", "e_type", f"e{gidx}")
-
-        e_year = st.text_input("연도 (골글·시그)", value=str(sel.get("year") or ""), placeholder="예: 22, 96, 08", key=f"e_year_{gidx}")
-
-        # Impac
-        st.markdown('<div class="flabel">임팩 종류 (임팩 카드)</div>', unsafe_allow_html=True)
-        imp_chunks = [IMPAC_TYPES[i:i+8] for i in range(0, len(IMPAC_TYPES), 8)]
-        for chunk in imp_chunks:
-            eicols = st.columns(8)
-            for j, opt in enumerate(chunk):
-                active = st.session_state["e_impac"] == opt
-                with eicols[j]:
-                    if st.button(opt, key=f"e_impac__{opt}__{gidx}", use_container_width=True, type="primary" if active else "secondary"):
-                        e_single("e_impac", opt); st.rerun()
-
-        # Pitches
-        st.markdown('<div class="flabel">구종</div>', unsafe_allow_html=True)
-        pitch_chunks = [PITCH_TYPES[i:i+5] for i in range(0, len(PITCH_TYPES), 5)]
-        for chunk in pitch_chunks:
-            epcols = st.columns(5)
-            for j, opt in enumerate(chunk):
-                active = opt in st.session_state["e_pitches"]
-                with epcols[j]:
-                    if st.button(opt, key=f"e_pitch__{opt}__{gidx}", use_container_width=True, type="primary" if active else "secondary"):
-                        e_multi("e_pitches", opt); st.rerun()
+elif "✏️ 선수 편집" in page:
+    st.markdown('<div class="section-title">선수 편집 / 삭제</div>', unsafe_allow_html=True)
 
-        st.markdown("---")
-        cs, cd = st.columns(2)
-        with cs:
-            if st.button("💾 저장", use_container_width=True, type="primary", key=f"e_save_{gidx}"):
-                ptype = st.session_state["e_type"]
-                yr_s = e_year.strip()
-                year_val = None
-                if yr_s:
-                    try: year_val = yr_s  # keep as string to preserve leading zeros
-                    except: pass
-                impac_val = st.session_state["e_impac"] if ptype == "임팩" and st.session_state["e_impac"] else None
-                st.session_state.players[gidx] = {
-                    "team": st.session_state["e_team"] or sel["team"],
-                    "role": st.session_state["e_role"] or sel["role"],
-                    "raw_prefix": yr_s if ptype in ("골글","시그") else (impac_val or ""),
-                    "name": e_name,
-                    "pitches": list(st.session_state["e_pitches"]),
-                    "player_type": ptype or sel.get("player_type",""),
-                    "year": year_val,
-                    "impac_type": impac_val,
-                }
-                save_data(st.session_state.players)
-                st.session_state["_etarget"] = None
-                st.success("✅ 저장 완료!")
-                st.rerun()
-        with cd:
-            if st.button("🗑️ 삭제", use_container_width=True, key=f"e_del_{gidx}"):
-                st.session_state.players.pop(gidx)
-                save_data(st.session_state.players)
-                st.session_state["_etarget"] = None
-                st.success("🗑️ 삭제 완료!")
-                st.rerun()
\ No newline at end of file
+    @_fragment
+    def edit_page():
+        """Search, list and form in one fragment: toggles, saves and deletes rerun only this page."""
+        repo = store.repo
+
+        c1,c2 = st.columns(2)
+        with c1: search = st.text_input("선수명 검색")
+        with c2: team_f = st.selectbox("팀 필터", ["전체"]+TEAMS)
+
+        def p_summary(p):
+            if p is None:
+                return "(삭제됨)"
+            return f"{p['name']} ({p['team']}, {p['role']}, {p.get('player_type','')} {p.get('year','') or p.get('impac_type','') or ''}) · {'/'.join(p.get('pitches', []))}"
+
+        # Conflicts the Gist save could not merge (someone else changed the same player)
+        with store.lock:
+            conflicts = list(store.conflicts)
+        if conflicts:
+            with st.expander(f"⚠️ 동시 편집 충돌 {len(conflicts)}건", expanded=True):
+                for n, c in enumerate(conflicts):
+                    st.markdown(f"**내 변경**: {p_summary(c['mine'])}  \n**다른 사용자**: {p_summary(c['theirs'])}")
+                    k1, k2 = st.columns(2)
+                    with k1:
+                        st.button("내 변경 적용", key=f"e_conf_mine_{n}", use_container_width=True,
+                                  type="primary" if c["kept"] == "mine" else "secondary",
+                                  on_click=store.resolve, args=(c, "mine"))
+                    with k2:
+                        st.button("다른 사용자 것 유지", key=f"e_conf_theirs_{n}", use_container_width=True,
+                                  type="primary" if c["kept"] == "theirs" else "secondary",
+                                  on_click=store.resolve, args=(c, "theirs"))
+
+        with store.lock:
+            filtered = {pid: dict(repo.get(pid)) for pid in repo.ids(repo.index.query(name=search, team=() if team_f == "전체" else (team_f,)))}
+            versions = {pid: repo.version(pid) for pid in filtered}
+
+        if not filtered:
+            st.info("선수를 검색하세요.")
+        else:
+            def e_label(pid):
+                p = filtered[pid]
+                return f"{p['name']} ({p['team']}, {p['role']}, {p.get('player_type','')} {p.get('year','') or p.get('impac_type','') or ''})"
+            gidx = st.selectbox("편집할 선수 선택", list(filtered), format_func=e_label)
+            sel = filtered[gidx]
+
+            if st.session_state.get("_etarget") != gidx:
+                st.session_state["_etarget"] = gidx
+                st.session_state["_eversion"] = versions[gidx]  # saves only apply on top of this version
+                st.session_state.pop("_e_conflict", None)
+                st.session_state["e_team"] = sel.get("team","")
+                st.session_state["e_role"] = sel.get("role","")
+                st.session_state["e_type"] = sel.get("player_type","")
+                st.session_state["e_impac"] = sel.get("impac_type","") or ""
+                st.session_state["e_pitches"] = set(sel.get("pitches",[]))
+
+            def edit_form(gidx, sel):
+                st.markdown("---")
+                st.text_input("선수명", value=sel["name"], key=f"e_name_{gidx}")
+
+                fbtn_row("팀", TEAMS, "e_team", key=f"e_team_{gidx}")
+                fbtn_row("역할", ROLES, "e_role", key=f"e_role_{gidx}")
+
+                card_type_row("카드 종류", "e_type", f"e{gidx}")
+
+                st.text_input("연도 (골글·시그)", value=str(sel.get("year") or ""), placeholder="예: 22, 96, 08", key=f"e_year_{gidx}")
+
+                fbtn_row("임팩 종류 (임팩 카드)", IMPAC_TYPES, "e_impac", per_row=8, key=f"e_impac_{gidx}")
+                fbtn_row("구종", PITCH_TYPES, "e_pitches", multi=True, per_row=5, key=f"e_pitch_{gidx}")
+
+                def e_save(gidx, sel, force=False):
+                    ptype = st.session_state["e_type"]
+                    yr_s = st.session_state[f"e_year_{gidx}"].strip()
+                    year_val = None
+                    if yr_s:
+                        try: year_val = yr_s  # keep as string to preserve leading zeros
+                        except: pass
+                    impac_val = st.session_state["e_impac"] if ptype == "임팩" and st.session_state["e_impac"] else None
+                    p = {
+                        "team": st.session_state["e_team"] or sel["team"],
+                        "role": st.session_state["e_role"] or sel["role"],
+                        "raw_prefix": yr_s if ptype in ("골글","시그") else (impac_val or ""),
+                        "name": st.session_state[f"e_name_{gidx}"],
+                        "pitches": list(st.session_state["e_pitches"]),
+                        "player_type": ptype or sel.get("player_type",""),
+                        "year": year_val,
+                        "impac_type": impac_val,
+                    }
+                    try:
+                        store.update(gidx, p, expected=None if force else st.session_state["_eversion"])
+                    except Conflict as c:
+                        st.session_state["_e_conflict"] = (gidx, p, c.current)
+                        return
+                    except KeyError:
+                        st.session_state["_e_msg"] = ("error", "다른 사용자가 이미 삭제한 선수입니다.")
+                    else:
+                        st.session_state["_etarget"] = None
+                        st.session_state["_e_msg"] = ("success", "✅ 저장 완료!")
+
+                def e_delete(gidx, force=False):
+                    try:
+                        store.delete(gidx, expected=None if force else st.session_state["_eversion"])
+                    except Conflict as c:
+                        st.session_state["_e_conflict"] = (gidx, None, c.current)
+                        return
+                    except KeyError:
+                        pass  # already deleted by another session
+                    st.session_state["_etarget"] = None
+                    st.session_state["_e_msg"] = ("success", "🗑️ 삭제 완료!")
+
+                def e_reload(gidx):
+                    for k in ("_etarget", "_e_conflict", f"e_name_{gidx}", f"e_year_{gidx}"):
+                        st.session_state.pop(k, None)
+
+                st.markdown("---")
+                cs, cd = st.columns(2)
+                with cs:
+                    st.button("💾 저장", use_container_width=True, type="primary", key=f"e_save_{gidx}",
+                              on_click=e_save, args=(gidx, sel))
+                with cd:
+                    st.button("🗑️ 삭제", use_container_width=True, key=f"e_del_{gidx}", on_click=e_delete, args=(gidx,))
+
+                conflict = st.session_state.get("_e_conflict")
+                if conflict and conflict[0] == gidx:
+                    _, mine, current = conflict
+                    st.warning("편집하는 동안 다른 사용자가 이 선수를 수정했습니다.")
+                    st.markdown(f"**내 변경**: {p_summary(mine)}  \n**현재 저장된 내용**: {p_summary(current)}")
+                    k1, k2 = st.columns(2)
+                    with k1:
+                        st.button("내 변경으로 덮어쓰기", key=f"e_force_{gidx}", use_container_width=True,
+                                  on_click=e_save if mine else e_delete, args=(gidx, sel, True) if mine else (gidx, True))
+                    with k2:
+                        st.button("최신 내용 불러오기", key=f"e_reload_{gidx}", use_container_width=True,
+                                  on_click=e_reload, args=(gidx,))
+
+            edit_form(gidx, sel)
+
+        if "_e_msg" in st.session_state:
+            kind, msg = st.session_state.pop("_e_msg")
+            getattr(st, kind)(msg)
+
+    edit_page()
+
+_end_run()
@@ -0,0 +1,61 @@
+"""Random players, 🔍 검색 filter sets and edits for the index and repo tests."""
+import random
+
+import pytest
+
+from pitchdb.constants import IMPAC_TYPES, PITCH_TYPES, ROLES, TEAMS, TYPE_CFG
+
+NAMES = ["류현진", "김광현", "양현종", "류현종", "김현수", "페디", "미란다", "고우석", "오승환", "구창모"]
+YEARS = [None, "22", "96", "08"]
+
+
+@pytest.fixture
+def rng():
+    return random.Random(20240501)
+
+
+@pytest.fixture
+def make_player(rng):
+    def make():
+        ptype = rng.choice(list(TYPE_CFG))
+        year = rng.choice(YEARS) if ptype in ("골글", "시그") else None
+        impac = rng.choice(IMPAC_TYPES) if ptype == "임팩" else None
+        return {"team": rng.choice(TEAMS), "role": rng.choice(ROLES), "raw_prefix": year or impac or "",
+                "name": rng.choice(NAMES), "pitches": rng.sample(PITCH_TYPES, rng.randint(1, 4)),
+                "player_type": ptype, "year": year, "impac_type": impac}
+    return make
+
+
+@pytest.fixture
+def make_query(rng):
+    """Keyword arguments for ``PlayerIndex.query``; each filter is set about a third of the time."""
+    def make():
+        q = {}
+        for field, values, most in (("team", TEAMS, 3), ("role", ROLES, 2), ("player_type", list(TYPE_CFG), 2),
+                                    ("impac_type", IMPAC_TYPES, 3), ("pitches", PITCH_TYPES, 2)):
+            if rng.random() < 0.35:
+                q[field] = set(rng.sample(values, rng.randint(1, most)))
+        if rng.random() < 0.2:
+            q["year"] = rng.choice(["22", "96", "08", "1"])
+        if rng.random() < 0.35:
+            name = rng.choice(NAMES)
+            start = rng.randrange(len(name))
+            q["name"] = name[start:start + rng.randint(1, 2)]
+        return q
+    return make
+
+
+@pytest.fixture
+def edit_randomly(make_player, rng):
+    """``edit(repo, steps)``: that many random inserts, updates and deletes."""
+    def edit(repo, steps):
+        for _ in range(steps):
+            ids = repo.ids()
+            r = rng.random()
+            if r < 0.4 or not ids:
+                repo.insert(make_player())
+            elif r < 0.7:
+                repo.update(rng.choice(ids), make_player())
+            else:
+                repo.delete(rng.choice(ids))
+    return edit
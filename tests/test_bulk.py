@@ -0,0 +1,92 @@
+import io
+import json
+
+from pitchdb.bulk import export_lines, import_rows, read_rows
+from pitchdb.migrations import wrap
+from pitchdb.snapshot import FORMATS, dumps
+
+
+def rows(data, fmt):
+    return list(read_rows(io.BytesIO(data), fmt))
+
+
+def test_csv_with_bom_imports():
+    data = "﻿team,role,raw_prefix,name,pitches\nLG,선발,22,류현진,포심/커브\n".encode("utf-8")
+    players, errors, dupes = import_rows(rows(data, "csv"))
+    assert errors == [] and dupes == 0
+    assert players == [{"team": "LG", "role": "선발", "raw_prefix": "22", "name": "류현진",
+                        "pitches": ["포심", "커브"], "player_type": "시그", "year": "22", "impac_type": None}]
+
+
+def test_bad_rows_are_reported_by_line():
+    data = ("team,role,raw_prefix,name,pitches\n"
+            "LG,선발,,류현진,포심\n"
+            "독립,선발,,김광현,포심\n"
+            "LG,선발,,양현종,너클볼\n"
+            "LG,마무리,,,\n").encode("utf-8")
+    players, errors, _ = import_rows(rows(data, "csv"))
+    assert [p["name"] for p in players] == ["류현진"]
+    assert [n for n, _ in errors] == [3, 4, 5]
+    assert "독립" in errors[0][1] and "너클볼" in errors[1][1]
+    assert "선수명 없음" in errors[2][1] and "구종 없음" in errors[2][1]
+
+
+def test_jsonl_errors_and_non_objects():
+    data = ('{"team": "LG", "role": "선발", "name": "a", "pitches": "포심 커브"}\n'
+            "\n"
+            '{"team": "LG",\n'
+            "[1, 2]\n").encode("utf-8")
+    players, errors, _ = import_rows(rows(data, "jsonl"))
+    assert players[0]["pitches"] == ["포심", "커브"]
+    assert [n for n, _ in errors] == [3, 4]
+    assert errors[0][1].startswith("JSON 오류") and errors[1][1] == "객체가 아닙니다"
+
+
+def test_duplicates_of_the_db_and_of_earlier_rows_are_skipped():
+    row = {"team": "LG", "role": "선발", "name": "a", "pitches": ["포심"], "player_type": "시그", "year": "22"}
+    existing, _ = import_rows([(1, dict(row), None)])[:2]
+    players, errors, dupes = import_rows([(1, {**row, "pitches": "포심"}, None),
+                                          (2, {**row, "name": "b"}, None),
+                                          (3, {**row, "name": "b"}, None)], existing)
+    assert [p["name"] for p in players] == ["b"] and errors == [] and dupes == 2
+
+
+def test_export_round_trips(make_player):
+    players = [make_player() for _ in range(50)]
+    unique = import_rows([(n, p, None) for n, p in enumerate(players, 1)])[0]
+    for fmt in ("csv", "jsonl"):
+        data = "".join(export_lines(unique, fmt)).encode("utf-8")
+        back, errors, dupes = import_rows(rows(data, fmt))
+        assert errors == [] and dupes == 0 and back == unique, fmt
+
+
+def test_cp949_csv_imports():
+    data = "team,role,raw_prefix,name,pitches\nLG,선발,22,류현진,포심\n".encode("cp949")
+    players, errors, _ = import_rows(rows(data, "csv"))
+    assert errors == [] and players[0]["name"] == "류현진"
+
+
+def test_undecodable_file_is_one_error():
+    [(line_no, row, error)] = rows(b"name\n\xff\xfe\xff\n", "csv")
+    assert line_no == 0 and row is None and "인코딩" in error
+
+
+def test_malformed_values_are_row_errors():
+    base = {"team": "LG", "role": "선발", "name": "a", "pitches": ["포심"]}
+    data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in (
+        {**base, "name": ["a"]},
+        {**base, "team": {"x": 1}},
+        {**base, "pitches": 3},
+        {**base, "pitches": ["포심", 7]},
+        base)).encode("utf-8")
+    players, errors, _ = import_rows(rows(data, "jsonl"))
+    assert [n for n, _ in errors] == [1, 2, 3, 4] and len(players) == 1
+    assert "name" in errors[0][1] and "team" in errors[1][1] and "7" in errors[3][1]
+
+
+def test_saved_json_documents_import_in_any_format(make_player):
+    players = import_rows([(n, make_player(), None) for n in range(30)])[0]
+    for fmt in FORMATS:
+        back, errors, _ = import_rows(rows(dumps(wrap(players), fmt).encode("utf-8"), "json"))
+        assert errors == [] and back == players, fmt
+    assert rows(b"[1, {", "json")[0][:2] == (0, None)
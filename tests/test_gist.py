@@ -0,0 +1,112 @@
+"""GistClient against a local HTTP server that injects latency and errors."""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from pitchdb.gist import CircuitOpen, GistClient
+from pitchdb.persist import WriteBehind
+
+
+class FakeAPI(BaseHTTPRequestHandler):
+    """Serves ``{"ok": true}``; each request first takes the next entry of
+    ``server.plan``: ``"500"``, ``"503"``, ``"slow"`` (sleeps past the read
+    timeout) or ``"ok"`` (also the default once the plan is used up)."""
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self):
+        self.server.hits.append(self.command)
+        step = self.server.plan.pop(0) if self.server.plan else "ok"
+        if step == "slow":
+            time.sleep(0.5)
+        body = b"" if step in ("500", "503") else json.dumps({"ok": True}).encode()
+        self.send_response(int(step) if step in ("500", "503") else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            pass   # the client timed out first
+
+    do_GET = do_PATCH = _reply
+
+
+@pytest.fixture
+def server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FakeAPI)
+    srv.plan, srv.hits = [], []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def client(srv, **kw):
+    kw = {"timeout": (1.0, 0.2), "retries": 2, "backoff": 0.01, "failures": 2, "cooldown": 0.3, **kw}
+    return GistClient(f"http://127.0.0.1:{srv.server_port}/gists/x", "token", **kw)
+
+
+def test_retries_errors_and_timeouts_then_succeeds(server):
+    server.plan[:] = ["503", "slow"]
+    c = client(server)
+    r = c.get()
+    assert r.status_code == 200 and r.json() == {"ok": True}
+    assert len(server.hits) == 3
+    assert c.status()["state"] == "closed"
+
+
+def test_read_timeout_bounds_a_hanging_call(server):
+    server.plan[:] = ["slow"] * 3
+    c = client(server, failures=5)
+    t = time.perf_counter()
+    with pytest.raises(ConnectionError):
+        c.get()
+    assert time.perf_counter() - t < 1.5   # 3 attempts x 0.2 s read timeout + backoff
+    assert c.status()["failed"] == 1
+
+
+def test_breaker_opens_rejects_fast_and_recovers(server):
+    server.plan[:] = ["500"] * 6
+    c = client(server)
+    assert c.get().status_code == 500     # retries used up: the last response is returned
+    assert c.get().status_code == 500
+    assert c.status()["state"] == "open" and c.status()["trips"] == 1
+    hits = len(server.hits)
+    with pytest.raises(CircuitOpen):
+        c.patch(json={})
+    assert len(server.hits) == hits and c.status()["rejected"] == 1
+    time.sleep(0.35)
+    assert c.get().status_code == 200      # the probe closes it again
+    assert c.status()["state"] == "closed"
+
+
+def test_failed_probe_reopens(server):
+    server.plan[:] = ["500"] * 9
+    c = client(server)
+    c.get(), c.get()
+    time.sleep(0.35)
+    c.get()
+    assert c.status()["state"] == "open" and c.status()["trips"] == 2
+
+
+def test_open_breaker_sends_saves_straight_to_the_fallback(server):
+    server.plan[:] = ["500"] * 6
+    c = client(server)
+    c.get(), c.get()
+    local = []
+    wb = WriteBehind(lambda data: c.patch(json=data), delay=0, retries=4, backoff=5,
+                     fallback=local.append, fail_fast=(CircuitOpen,))
+    t = time.perf_counter()
+    wb.mark_dirty({"files": {}})
+    assert wb.flush(timeout=3)
+    assert time.perf_counter() - t < 1       # no 5 s, 10 s … backoff sleeps
+    st = wb.status()
+    assert local == [{"files": {}}]
+    assert st["state"] == "fallback" and st["fallbacks"] == 1 and st["last_fallback"]
+    wb.close()
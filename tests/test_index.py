@@ -0,0 +1,43 @@
+from pitchdb.index import PlayerIndex, iter_bits
+
+
+def plain_filter(players, q):
+    """Positions the search page's original list comprehensions kept."""
+    keep = []
+    for i, p in enumerate(players):
+        if q.get("name") and q["name"] not in p["name"]:
+            continue
+        if q.get("team") and p["team"] not in q["team"]:
+            continue
+        if q.get("role") and p["role"] not in q["role"]:
+            continue
+        if q.get("player_type") and p.get("player_type") not in q["player_type"]:
+            continue
+        if q.get("impac_type") and p.get("impac_type") not in q["impac_type"]:
+            continue
+        if q.get("pitches") and not all(pt in p.get("pitches", []) for pt in q["pitches"]):
+            continue
+        if q.get("year") and str(p.get("year") or "") != q["year"]:
+            continue
+        keep.append(i)
+    return keep
+
+
+def test_query_matches_a_plain_filter(make_player, make_query):
+    players = [make_player() for _ in range(300)]
+    index = PlayerIndex(players)
+    for _ in range(2000):
+        q = make_query()
+        assert list(iter_bits(index.query(**q))) == plain_filter(players, q), q
+
+
+def test_no_filter_is_everyone():
+    players = [{"team": "LG", "role": "선발", "name": "a", "pitches": []}] * 3
+    assert PlayerIndex(players).query() == 0b111
+    assert PlayerIndex().query(team={"LG"}) == 0
+
+
+def test_iter_bits_is_ascending():
+    assert list(iter_bits(0)) == []
+    assert list(iter_bits(0b101001)) == [0, 3, 5]
+    assert list(iter_bits(1 << 200 | 1)) == [0, 200]
@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+from pitchdb.journal import Journal
+from pitchdb.migrations import SCHEMA_VERSION, wrap
+
+
+def P(name, **kw):
+    return {"team": "LG", "role": "선발", "raw_prefix": "", "name": name, "pitches": ["포심"],
+            "player_type": "시그", "year": None, "impac_type": None, **kw}
+
+
+def test_missing_snapshot_is_seeded(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    players, ids = Journal(path).load(lambda: [P("a"), P("b")])
+    assert [p["name"] for p in players] == ["a", "b"] and ids == [0, 1]
+    assert json.loads(path.read_text(encoding="utf-8")) == wrap([P("a"), P("b")])
+
+
+def test_log_is_replayed_onto_the_snapshot(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    j = Journal(path)
+    j.load(lambda: [P("a"), P("b"), P("c")])
+    j.apply("update", 0, P("a2"))
+    j.apply("delete", 1)
+    j.apply("insert", 3, P("d"))
+    players, ids = Journal(path).load(None)
+    assert ids == [0, 2, 3]
+    assert [p["name"] for p in players] == ["a2", "c", "d"]
+
+
+def test_torn_last_line_is_dropped_and_compacted(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    j = Journal(path)
+    j.load(lambda: [P("a")])
+    j.apply("insert", 1, P("b"))
+    with open(j.log_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "insert", "id": 2, "p": {"na')
+    players, ids = Journal(path).load(None)
+    assert ids == [0, 1]
+    assert len(j.log_path.read_text(encoding="utf-8").splitlines()) == 1   # just the new base line
+
+
+def test_log_for_another_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    j = Journal(path)
+    j.load(lambda: [P("a")])
+    j.apply("update", 0, P("stale"))
+    path.write_text(json.dumps(wrap([P("new")])), encoding="utf-8")
+    players, ids = Journal(path).load(None)
+    assert [p["name"] for p in players] == ["new"]
+    assert not j.log_path.exists()
+
+
+def test_compaction_keeps_ids_and_restarts_the_log(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    j = Journal(path, compact_every=2)
+    j.load(lambda: [P("a"), P("b")])
+    j.apply("delete", 0)
+    assert len(j.log_path.read_text(encoding="utf-8").splitlines()) == 2
+    j.apply("insert", 2, P("c"))   # second entry: compacts
+    assert len(j.log_path.read_text(encoding="utf-8").splitlines()) == 1
+    assert [p["name"] for p in json.loads(path.read_text(encoding="utf-8"))["players"]] == ["b", "c"]
+    players, ids = Journal(path).load(None)
+    assert ids == [1, 2] and [p["name"] for p in players] == ["b", "c"]
+
+
+def test_old_snapshot_is_migrated_once(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    path.write_text(json.dumps([P("a", team="골글"), P("b", impac_type="국에")]), encoding="utf-8")
+    players, ids = Journal(path).load(None)
+    assert [(p["team"], p["player_type"], p["impac_type"]) for p in players] == [("삼성", "골글", None),
+                                                                             ("LG", "국대", None)]
+    text = path.read_text(encoding="utf-8")
+    assert json.loads(text) == {"schema_version": SCHEMA_VERSION, "players": players}
+    assert Journal(path).load(None) == (players, ids) and path.read_text(encoding="utf-8") == text
+
+
+def test_old_snapshot_needing_no_changes_is_left_alone(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    text = json.dumps([P("a"), P("b", team="삼성", player_type="골글")], ensure_ascii=False, indent=2)
+    path.write_text(text, encoding="utf-8")
+    players, ids = Journal(path).load(None)
+    assert [p["name"] for p in players] == ["a", "b"] and ids == [0, 1]
+    assert path.read_text(encoding="utf-8") == text and not Journal(path).log_path.exists()
+
+
+def test_tracked_data_file_loads_without_a_rewrite(tmp_path):
+    path = tmp_path / "pitcher_data.json"
+    text = (Path(__file__).parent.parent / "pitcher_data.json").read_text(encoding="utf-8")
+    path.write_text(text, encoding="utf-8")
+    Journal(path).load(None)
+    assert hash(path.read_text(encoding="utf-8")) == hash(text)   # no multi-thousand-line diff on failure
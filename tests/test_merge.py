@@ -0,0 +1,39 @@
+from pitchdb.merge import merge
+
+A, B, C = {"name": "a"}, {"name": "b"}, {"name": "c"}
+
+
+def test_one_sided_changes_are_taken():
+    base = {0: A, 1: B}
+    merged, conflicts = merge(base, {0: C, 1: B}, {0: A})   # we edit 0, they delete 1
+    assert merged == {0: C} and conflicts == []
+
+
+def test_same_change_on_both_sides_is_not_a_conflict():
+    merged, conflicts = merge({0: A}, {0: B}, {0: B})
+    assert merged == {0: B} and conflicts == []
+
+
+def test_both_sides_edit_keeps_theirs():
+    merged, conflicts = merge({0: A}, {0: B}, {0: C})
+    assert merged == {0: C}
+    assert conflicts == [{"id": 0, "mine": B, "theirs": C, "kept": "theirs"}]
+
+
+def test_edit_beats_delete():
+    merged, conflicts = merge({0: A}, {0: B}, {})
+    assert merged == {0: B}
+    assert conflicts == [{"id": 0, "mine": B, "theirs": None, "kept": "mine"}]
+    merged, conflicts = merge({0: A}, {}, {0: C})
+    assert merged == {0: C} and conflicts[0]["kept"] == "theirs"
+
+
+def test_insert_collision_keeps_both():
+    merged, conflicts = merge({0: A}, {0: A, 1: B}, {0: A, 1: C})
+    assert merged == {0: A, 1: C, 2: B} and conflicts == []
+
+
+def test_unknown_base_keeps_theirs_and_reports_our_differences():
+    merged, conflicts = merge(None, {0: B, 1: B}, {0: A, 1: B, 2: C})
+    assert merged == {0: A, 1: B, 2: C}
+    assert conflicts == [{"id": 0, "mine": B, "theirs": A, "kept": "theirs"}]
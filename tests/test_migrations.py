@@ -0,0 +1,46 @@
+import copy
+
+from pitchdb.bulk import to_player
+from pitchdb.migrations import SCHEMA_VERSION, classify, migrate, parse_prefix, unwrap, upgrade, wrap
+
+
+def P(name, **kw):
+    return {"team": "LG", "role": "선발", "raw_prefix": "", "name": name, "pitches": ["포심"],
+            "player_type": "시그", "year": None, "impac_type": None, **kw}
+
+
+def test_parse_prefix():
+    assert parse_prefix("22") == ("시그", "22", None)
+    assert parse_prefix("22우에") == ("시그", "22", "우에")
+    assert parse_prefix("여사") == ("임팩", None, "여사")
+    assert parse_prefix("FA") == ("임팩", None, "FA")
+    assert parse_prefix("국대") == ("국대", None, None) and parse_prefix("라이브") == ("라이브", None, None)
+    assert parse_prefix("골") == ("골글", None, None)
+    assert parse_prefix("") == ("시그", None, None) and parse_prefix("마무리") == ("임팩", None, "마무리")
+    assert classify(["22", "골"]) == [("시그", "22", None), ("골글", None, None)]
+
+
+def test_v1_moves_card_types_out_of_team_and_impac():
+    players = [P("a", team="골글"), P("b", player_type="임팩", impac_type="국에"),
+               P("c", player_type="임팩", impac_type="라이브"), P("d", player_type="임팩", impac_type="여사")]
+    migrate(players, 0)
+    assert [(p["team"], p["player_type"], p["impac_type"]) for p in players] == [
+        ("삼성", "골글", None), ("LG", "국대", None), ("LG", "라이브", None), ("LG", "임팩", "여사")]
+
+
+def test_bare_list_is_version_0():
+    assert unwrap([P("a")]) == ([P("a")], 0)
+    assert upgrade([P("a", team="골글")])[0]["team"] == "삼성"
+
+
+def test_current_documents_are_not_migrated_again():
+    doc = wrap([P("a", team="골글")])   # a team no current migration would produce; left alone
+    assert doc["schema_version"] == SCHEMA_VERSION
+    assert upgrade(copy.deepcopy(doc)) == doc["players"]
+    assert unwrap(doc) == (doc["players"], SCHEMA_VERSION)
+
+
+def test_bulk_rows_get_the_same_migrations():
+    p, errors = to_player({"team": "골글", "role": "선발", "name": "a", "pitches": "포심",
+                           "player_type": "임팩", "impac_type": "국에"})
+    assert errors == [] and (p["team"], p["player_type"], p["impac_type"]) == ("삼성", "국대", None)
@@ -0,0 +1,63 @@
+from pitchdb.index import iter_bits
+from pitchdb.names import NameIndex, chosung, is_chosung, jamo
+
+NAMES = ["류현진", "류현종", "양현종", "김광현", "페디", "Kelly"]
+
+
+def build():
+    idx = NameIndex()
+    for pos, name in enumerate(NAMES):
+        idx.add(name, pos)
+    return idx
+
+
+def hits(idx, q):
+    return [NAMES[pos] for pos in iter_bits(idx.mask(q))]
+
+
+def test_decomposition():
+    assert jamo("럼") == "ㄹㅓㅁ" and jamo("류현진") == "ㄹㅠㅎㅕㄴㅈㅣㄴ"
+    assert chosung("류현진") == "ㄹㅎㅈ" and chosung("Kelly 1") == "kelly 1"
+    assert is_chosung("ㄹㅎㅈ") and is_chosung("ㄹㅎ ㅈ")
+    assert not is_chosung("류ㅎㅈ") and not is_chosung("")
+
+
+def test_substring_matches():
+    idx = build()
+    assert hits(idx, "현") == ["류현진", "류현종", "양현종", "김광현"]
+    assert hits(idx, "현종") == ["류현종", "양현종"]
+    assert hits(idx, "페디") == ["페디"] and hits(idx, "Kel") == ["Kelly"]
+    assert hits(idx, "현진이") == [] and hits(idx, "kel") == []   # plain queries are case-sensitive
+
+
+def test_chosung_matches():
+    idx = build()
+    assert hits(idx, "ㄹㅎㅈ") == ["류현진", "류현종"]
+    assert hits(idx, "ㅎㅈ") == ["류현진", "류현종", "양현종"]
+    assert hits(idx, "ㄹㅎ ㅈ") == ["류현진", "류현종"]   # spaces between 초성 are ignored
+    assert hits(idx, "ㄱ") == ["김광현"]
+
+
+def test_blank_query_is_no_filter():
+    idx = build()
+    assert hits(idx, "") == NAMES
+    assert hits(idx, " ") == NAMES and hits(idx, "   ") == NAMES
+
+
+def test_removed_names_stop_matching():
+    idx = build()
+    idx.add("류현진", 6)
+    idx.remove("류현진", 0)
+    assert idx.mask("류현진") == 1 << 6
+    idx.remove("류현진", 6)
+    assert idx.mask("류현진") == 0 and hits(idx, "ㄹㅎㅈ") == ["류현종"]
+    assert "류현진" not in idx.jamo and all("류현진" not in s for s in idx.jamo_grams.values())
+
+
+def test_suggest_tolerates_typos():
+    idx = build()
+    assert idx.suggest("류현진") == [("류현진", 0), ("류현종", 2)]   # exact first, then within max(1, len/3) jamo edits
+    assert idx.suggest("류현잔")[0] == ("류현진", 1)
+    assert sorted(idx.suggest("ㄹㅎ")) == [("류현종", 0), ("류현진", 0)]
+    assert idx.suggest("") == [] and idx.suggest(" ") == [] and idx.suggest("   ") == []
+    assert idx.suggest(" 류현진 ") == idx.suggest("류현진")
@@ -0,0 +1,58 @@
+import pytest
+
+from pitchdb.repo import PlayerRepo
+
+
+def test_incremental_changes_match_a_rebuild(make_player, make_query, edit_randomly):
+    repo = PlayerRepo([make_player() for _ in range(150)])
+    for _ in range(6):
+        edit_randomly(repo, 50)
+        fresh = PlayerRepo(repo.to_list())
+        live = repo.ids()
+        assert [dict(repo.get(pid)) for pid in live] == [dict(fresh.get(pid)) for pid in fresh.ids()]
+        pos = {pid: i for i, pid in enumerate(live)}   # id -> its row in the rebuilt repo
+        for _ in range(200):
+            q = make_query()
+            assert [pos[pid] for pid in repo.ids(repo.index.query(**q))] == fresh.ids(fresh.index.query(**q)), q
+
+
+def test_ids_are_stable_across_deletes(make_player):
+    repo = PlayerRepo([make_player() for _ in range(4)])
+    third = dict(repo.get(3))
+    repo.delete(1)
+    assert repo.ids() == [0, 2, 3] and len(repo) == 3
+    assert repo.get(1) is None and dict(repo.get(3)) == third
+    assert repo.insert(make_player()) == 4   # holes are not reused
+    with pytest.raises(KeyError):
+        repo.update(1, make_player())
+    with pytest.raises(KeyError):
+        repo.delete(1)
+
+
+def test_versions_are_not_reused_after_delete_and_reinsert(make_player):
+    repo = PlayerRepo([make_player() for _ in range(3)])
+    seen = {repo.version(pid) for pid in repo.ids()}
+    before = repo.version(1)
+    repo.delete(1)
+    repo.insert(make_player(), 1)
+    assert repo.version(1) != before and repo.version(1) not in seen
+    repo.update(1, make_player())
+    assert repo.version(1) not in seen
+
+
+def test_bulk_build_matches_record_inserts(make_player, make_query, rng):
+    players = [make_player() for _ in range(300)]
+    ids = sorted(rng.sample(range(1000), len(players)))   # sparse, like a repo after deletes
+    bulk = PlayerRepo(players, ids)
+    one_by_one = PlayerRepo([])
+    for pid, p in zip(ids, players):
+        one_by_one.insert(p, pid)
+    a, b = bulk.index, one_by_one.index
+    assert a.all == b.all and a.bits == b.bits and a.pitch_bits == b.pitch_bits
+    assert a.names.masks == b.names.masks and a.names.jamo_grams == b.names.jamo_grams
+    assert a.names.cho_grams == b.names.cho_grams
+    assert {m: o.order for m, o in bulk.orders.items()} == {m: o.order for m, o in one_by_one.orders.items()}
+    assert [a.table.to_dict(pid) for pid in ids] == [b.table.to_dict(pid) for pid in ids]
+    for _ in range(200):
+        q = make_query()
+        assert a.query(**q) == b.query(**q), q
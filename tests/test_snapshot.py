@@ -0,0 +1,26 @@
+import pytest
+
+from pitchdb.migrations import wrap
+from pitchdb.snapshot import FORMATS, dumps, loads
+
+
+def test_every_format_round_trips(make_player):
+    players = [make_player() for _ in range(100)]
+    players[3]["note"] = "메모"                     # a key outside the usual fields
+    doc = {**wrap(players), "ids": list(range(0, 200, 2))}
+    texts = {fmt: dumps(doc, fmt) for fmt in FORMATS}
+    for fmt, text in texts.items():
+        assert loads(text) == doc, fmt
+    assert texts["pretty"].startswith("{\n") and texts["dict"].startswith("{")
+    assert texts["gzip"].isascii() and len(texts["gzip"]) < len(texts["dict"]) < len(texts["pretty"])
+
+
+def test_empty_and_bare_list_documents():
+    for fmt in FORMATS:
+        assert loads(dumps(wrap([]), fmt)) == wrap([])
+        assert loads(dumps([{"name": "a"}], fmt)) == [{"name": "a"}]
+
+
+def test_unknown_format_is_an_error():
+    with pytest.raises(ValueError):
+        dumps(wrap([]), "yaml")
@@ -0,0 +1,15 @@
+from pitchdb.repo import PlayerRepo
+from pitchdb.sorting import SORT_KEYS
+
+
+def test_sorted_ids_match_a_stable_sort(make_player, make_query, edit_randomly):
+    repo = PlayerRepo([make_player() for _ in range(300)])
+    edit_randomly(repo, 200)
+    masks = [repo.index.query(**make_query()) for _ in range(300)]
+    sizes = {m.bit_count() for m in masks}
+    assert len(repo) in sizes and any(0 < n * 16 < len(repo) for n in sizes)   # every select path
+    for mode, key in SORT_KEYS.items():
+        for mask in masks:
+            # What the search page did before: a stable sort of the filtered list, which is in id order.
+            expected = sorted(repo.ids(mask), key=lambda pid: key(repo.get(pid)))
+            assert repo.sorted_ids(mode, mask) == expected, mode
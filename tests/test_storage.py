@@ -0,0 +1,66 @@
+import json
+
+from pitchdb.migrations import wrap
+from pitchdb.repo import PlayerRepo
+from pitchdb.storage import GIST_FILE, GistStorage, SQLiteStorage
+from pitchdb.sync import GistSync
+
+
+def P(name, **kw):
+    return {"team": "LG", "role": "선발", "raw_prefix": "", "name": name, "pitches": ["포심"],
+            "player_type": "시그", "year": None, "impac_type": None, **kw}
+
+
+class Response:
+    def __init__(self, body, status_code=200):
+        self.status_code, self.body, self.headers = status_code, body, {}
+
+    def json(self):
+        return self.body
+
+
+class FakeGist:
+    """Just enough of GistClient: one Gist whose files live in ``files``."""
+    url = "https://api.github.test/gists/x"
+
+    def __init__(self, files):
+        self.files, self.revision = files, 1
+
+    def _gist(self):
+        return {"files": {n: {"content": c} for n, c in self.files.items()},
+                "history": [{"version": str(self.revision)}]}
+
+    def get(self, url=None, headers=None):
+        if url == f"{self.url}/commits?per_page=1":
+            return Response([{"version": str(self.revision)}])
+        return Response(self._gist())
+
+    def patch(self, json):
+        for name, f in json["files"].items():
+            self.files[name] = f["content"]
+        self.revision += 1
+        return Response(self._gist())
+
+
+def test_save_without_a_loaded_base_does_not_overwrite_the_gist():
+    remote = [P("a"), P("b-remote"), P("c")]
+    gist = FakeGist({GIST_FILE: json.dumps(wrap(remote))})
+    storage = GistStorage(GistSync(gist))
+    rebased = []
+    storage.on_rebase = lambda changes, ours, conflicts: rebased.append((changes, conflicts))
+    storage.save([P("a"), P("b-local")])             # started from a stale local file
+    players, ids = GistStorage(GistSync(gist)).load()
+    assert players == remote and ids == [0, 1, 2]
+    changes, conflicts = rebased[0]
+    assert changes == [(1, P("b-remote")), (2, P("c"))]
+    assert conflicts == [{"id": 1, "mine": P("b-local"), "theirs": P("b-remote"), "kept": "theirs"}]
+
+
+def test_sqlite_query_matches_the_index(tmp_path, make_player, make_query, edit_randomly):
+    repo = PlayerRepo([make_player() for _ in range(300)])
+    edit_randomly(repo, 100)
+    db = SQLiteStorage(tmp_path / "players.db")
+    db.save(repo.to_list(), repo.ids())
+    for _ in range(1000):
+        q = make_query()
+        assert db.query(**q) == repo.ids(repo.index.query(**q)), q
@@ -0,0 +1,76 @@
+import pytest
+
+from pitchdb.store import Conflict, SharedStore
+
+
+def P(name, **kw):
+    return {"team": "LG", "role": "선발", "raw_prefix": "", "name": name, "pitches": ["포심"],
+            "player_type": "시그", "year": None, "impac_type": None, **kw}
+
+
+def test_stale_version_raises_conflict():
+    store = SharedStore([P("a"), P("b")])
+    seen = store.repo.version(0)
+    store.update(0, P("a2"))                       # another session saves first
+    with pytest.raises(Conflict) as e:
+        store.update(0, P("a3"), expected=seen)
+    assert e.value.pid == 0 and e.value.current == P("a2")
+    with pytest.raises(Conflict):
+        store.delete(0, expected=seen)
+    store.update(0, P("a3"), expected=store.repo.version(0))
+    assert store.repo.get(0) == P("a3")
+
+
+def test_rebased_skips_records_edited_since_the_upload():
+    store = SharedStore([P("a"), P("b")])
+    ours = {pid: dict(store.repo.get(pid)) for pid in store.repo.ids()}
+    store.update(1, P("b2"))                       # edited locally while the save was in flight
+    store.rebased([(0, P("a-theirs")), (1, P("b-theirs")), (2, P("c"))], ours, [])
+    assert store.repo.to_list() == [P("a-theirs"), P("b2"), P("c")]
+
+
+class FlakyBackend:
+    """Record-level backend whose next ``fail`` writes raise."""
+    incremental = True
+
+    def __init__(self):
+        self.fail, self.calls = 0, []
+
+    def _call(self, *call):
+        self.calls.append(call)
+        if self.fail:
+            self.fail -= 1
+            raise OSError("disk full")
+
+    def apply_many(self, changes):
+        self._call("apply_many", changes)
+
+    def save(self, players, ids=None):
+        self._call("save", players, ids)
+
+
+def test_write_through_result_is_reported():
+    backend = FlakyBackend()
+    store = SharedStore([P("a")], backend=backend)
+    assert store.status()["state"] == "idle" and store.status()["last_ok"] is None
+    store.update(0, P("a2"))
+    st = store.status()
+    assert st["state"] == "idle" and st["writes"] == 1 and st["last_ok"] and st["last_error"] is None
+    assert backend.calls == [("apply_many", [("update", 0, P("a2"))])]
+
+
+def test_failed_write_is_reported_and_the_next_one_saves_everything():
+    backend = FlakyBackend()
+    store = SharedStore([P("a"), P("b")], backend=backend)
+    backend.fail = 2
+    store.delete(0)                                 # not raised: the edit is already live
+    assert store.repo.ids() == [1]
+    st = store.status()
+    assert st["state"] == "failed" and st["last_error"] == "OSError: disk full" and st["writes"] == 0
+    store.insert(P("c"))                            # the full save fails too
+    assert store.status()["state"] == "failed"
+    store.update(1, P("b2"))
+    assert backend.calls[-1] == ("save", [P("b2"), P("c")], [1, 2])
+    assert store.status()["state"] == "idle" and store.status()["last_error"] is None
+    store.insert(P("d"))
+    assert backend.calls[-1] == ("apply_many", [("insert", 3, P("d"))])
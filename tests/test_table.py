@@ -0,0 +1,74 @@
+import pytest
+
+from pitchdb.constants import PITCH_TYPES
+from pitchdb.repo import PlayerRepo
+from pitchdb.table import Categorical, PlayerTable
+
+
+def P(name, **kw):
+    return {"team": "LG", "role": "선발", "raw_prefix": "22", "name": name, "pitches": ["커브", "포심"],
+            "player_type": "시그", "year": "22", "impac_type": None, **kw}
+
+
+def test_rows_read_back_as_the_stored_dicts(make_player):
+    t = PlayerTable()
+    players = [make_player() for _ in range(200)]
+    for pos, p in enumerate(players):
+        t.set(pos, p)
+    for pos, p in enumerate(players):
+        d = t.to_dict(pos)
+        assert sorted(d["pitches"], key=PITCH_TYPES.index) == d["pitches"]   # stored in PITCH_TYPES order
+        assert {**d, "pitches": set(d["pitches"])} == {**p, "pitches": set(p["pitches"])}
+        assert dict(t[pos]) == d
+
+
+def test_unknown_values_and_keys_survive():
+    t = PlayerTable()
+    p = P("a", team="독립", pitches=["포심", "너클볼"], note="메모")
+    t.set(0, p)
+    assert t.to_dict(0) == {**p, "pitches": ["포심", "너클볼"]}
+    assert t[0]["note"] == "메모" and t[0] == p
+
+
+def test_row_view_compares_like_a_dict():
+    t = PlayerTable()
+    t.set(0, P("a"))
+    t.set(1, P("a", pitches=["포심", "커브"]))
+    t.set(2, P("b"))
+    assert t[0] == P("a") and t[0] == t[1]
+    assert t[0] != t[2] and t[0] != P("a", role="중계") and t[0] != P("a", extra=1)
+
+
+def test_cleared_and_missing_rows_are_none():
+    t = PlayerTable()
+    t.set(2, P("c"))
+    assert t[0] is None and t[5] is None and len(t) == 3
+    t.clear(2)
+    assert t[2] is None
+    t.set(2, P("d"))
+    assert t[2]["name"] == "d"
+
+
+def test_comparing_does_not_grow_the_vocabularies():
+    t = PlayerTable()
+    t.set(0, P("a"))
+    sizes = {f: len(c.values) for f, c in t.cats.items()}
+    assert t[0] != P("a", team="독립", raw_prefix="새 접두어", year="1999")
+    assert {f: len(c.values) for f, c in t.cats.items()} == sizes
+
+
+def test_full_vocabulary_is_a_clear_error():
+    cat = Categorical(field="raw_prefix")
+    for i in range(Categorical.MAX_CODES - 1):
+        cat.code(str(i))
+    assert cat.code("0") == 1 and cat.code(None) == 0
+    with pytest.raises(ValueError, match="raw_prefix"):
+        cat.code("one more")
+
+
+def test_update_that_overflows_keeps_the_old_record():
+    repo = PlayerRepo([P("a", raw_prefix="22")])
+    repo.index.table.cats["raw_prefix"].MAX_CODES = 2   # None and "22"
+    with pytest.raises(ValueError):
+        repo.update(0, P("a", raw_prefix="23"))
+    assert repo.get(0) == P("a", raw_prefix="22") and repo.ids(repo.index.query(name="a")) == [0]